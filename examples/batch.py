@@ -8,15 +8,15 @@ from gmython.dispatch import dispatch_instance, DispatchError
 from contextlib import ExitStack
 from gmython.script import Script
 
-# Build the coordinate system
-coordsys = CoordinateSystem("MoonMJ2000Eq", LUNA, CoordinateSystemAxes.MJ2000Eq)
+# Build the coordinate system shared by every mission
+coordsys = CoordinateSystem("MoonMJ2000Eq", LUNA, CoordinateSystemAxes.MJ2000Eq).freeze()
 
 # Build the force model
 gravity = GravityField.moon(20, 20)
 model = ForceModel("LunaForceModel", gravity, body=LUNA, point_masses=[EARTH])
 
-# Build the propagator
-prop = Propagator("DefaultProp", model)
+# Build the propagator, freezing it (and its force model) since every mission shares it
+prop = Propagator("DefaultProp", model).freeze()
 
 # Build the satellites
 sats = []
@@ -36,8 +36,8 @@ with ExitStack() as stack:
         # Build the mission sequence
         mission = Propagate(prop, [sat], [("Sat1.ElapsedSecs", 12000.0)])
 
-        # Store the mission
-        missions.append(Script([coordsys, sat, model, prop, report], [mission]))
+        # Store the mission (the propagator, force model, spacecraft and coordinate system are collected from it)
+        missions.append(Script([report], [mission]))
 
     # Run the batch
     with dispatch_instance() as dispatch:
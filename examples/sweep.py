@@ -0,0 +1,41 @@
+from gmython.resources.spacecraft import Spacecraft, KeplerianState
+from gmython.resources.prop import GravityField, ForceModel, Propagator
+from gmython.mission import Propagate
+from gmython.resources.coordsys import CoordinateSystem, CoordinateSystemAxes
+from gmython.resources.celestial import EARTH, LUNA
+from gmython.resources.report import keplerian_headers, build_report_reader
+from gmython.dispatch import dispatch_instance, DispatchError
+from gmython.script import Script
+from gmython.sweep import compile_sweep
+
+# Build the coordinate system
+coordsys = CoordinateSystem("MoonMJ2000Eq", LUNA, CoordinateSystemAxes.MJ2000Eq)
+
+# Build the satellite
+state = KeplerianState(2000.0, 0.0, 0.0, 0.0, 0.0, 0.0)
+sat = Spacecraft("Sat1", state, coord_system=coordsys)
+
+# Build the propagator
+gravity = GravityField.moon(20, 20)
+model = ForceModel("LunaForceModel", gravity, body=LUNA, point_masses=[EARTH])
+prop = Propagator("DefaultProp", model)
+
+# Build the mission for a single inclination
+mission = Script([], [Propagate(prop, [sat], [("Sat1.ElapsedSecs", 12000.0)])])
+
+# The report only holds the row written at the end of each iteration
+with build_report_reader() as report:
+
+    # Sweep the inclination inside GMAT instead of running one script per inclination
+    script = compile_sweep(mission, f"{sat.name}.{coordsys.name}.INC", list(range(90 + 1)), keplerian_headers(sat, coordsys), report)
+
+    with dispatch_instance() as dispatch:
+        try:
+            dispatch.build_and_run(script)
+        except DispatchError as e:
+            with open(e.log) as log:
+                print(log.read())
+
+    # Print the final state for each inclination
+    for row in report.load():
+        print(row)
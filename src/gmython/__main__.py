@@ -0,0 +1,25 @@
+import argparse
+from .worker import WorkerAgent, DEFAULT_PORT
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(prog="gmython")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    worker = commands.add_parser("worker", help="Run GMAT scripts sent by a remote coordinator")
+    worker.add_argument("--host", default="127.0.0.1", help="Address to listen on")
+    worker.add_argument("--port", type=int, default=DEFAULT_PORT, help="Port to listen on")
+    worker.add_argument("--slots", type=int, default=None, help="Number of scripts to run at once (default: CPU count)")
+    worker.add_argument("--root", default=None, help="Directory for temporary run files")
+    worker.add_argument("--shm", action="store_true", help="Keep temporary run files in /dev/shm")
+
+    args = parser.parse_args(argv)
+    if args.command == "worker":
+        agent = WorkerAgent(args.host, args.port, args.slots, args.root, args.shm)
+        print(f"Listening on {agent.address[0]}:{agent.address[1]} with {agent.slots} slots")
+        try:
+            agent.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,31 @@
+import asyncio
+import hashlib
+import json
+import math
+import shutil
 import subprocess
 import os
+import re
 import tempfile
+import time
+from collections import OrderedDict
 from contextlib import contextmanager
+from enum import Enum
+from typing import Iterator
 from .script import Script, ScriptObject
+from .template import TemplateVariant
+from .mission import MissionStep, MissionLogic, Report, Propagate, ForLoop, TargetBlock, Vary, SolverMode
+from .resources.prop import Propagator
+from .resources.param import Param
+from .resources.variable import Variable
+from .resources.report import ReportFile, ReportReader, follow_report, parse_report, parse_report_columns
 
 cmdlet = None
 
+# Written by each script of an isolated batch once its mission finishes
+_MARKER_VARIABLE = Variable("IsolateMarkerValue")
+_BEGIN_MISSION = re.compile(r"^BeginMissionSequence;", re.MULTILINE)
+
 class DispatchError(Exception):
     def __init__(self, script: str | None, code: int, log: str):
         if script is None:
@@ -13,66 +33,876 @@ class DispatchError(Exception):
         else:
             super().__init__("Script " + script + " resulted in a return code of " + str(code))
         self.script = script
+        self.code = code
+        self.log = log
+
+    def __reduce__(self):
+        return (type(self), (self.script, self.code, self.log))
+
+class DispatchTimeout(DispatchError):
+    """Raised when GMAT is killed for running longer than its timeout"""
+    def __init__(self, script: str | None, timeout: float, log: str):
+        Exception.__init__(self, ("GMAT" if script is None else "Script " + script) + f" timed out after {timeout} seconds")
+        self.script = script
+        self.code = None
+        self.timeout = timeout
         self.log = log
 
+    def __reduce__(self):
+        return (type(self), (self.script, self.timeout, self.log))
+
+class RunStatus(Enum):
+    COMPLETED = 1
+    FAILED = 2
+    CACHED = 3
+    TIMEOUT = 4
+    RESUMED = 5
+
+class MissionResult:
+    """
+    A mission that has finished running
+
+    `data` holds the columns of each `ReportReader` of the script by report name, when the reports were parsed for it.
+    """
+    def __init__(self, index: int, script: Script, status: RunStatus = RunStatus.COMPLETED, error: DispatchError | None = None, data: dict[str, dict] | None = None):
+        self.index = index
+        self.script = script
+        self.status = status
+        self.error = error
+        self.data = data
+
+    @property
+    def cached(self) -> bool:
+        return self.status == RunStatus.CACHED
+
+class ResultCache:
+    """
+    On-disk cache of the report files produced by a script
+
+    Entries are keyed on the hash of the serialized script with its report paths normalized out,
+    so identical missions share an entry regardless of where their reports are written.
+    The least recently used entries are evicted once the cache grows past `max_bytes`.
+    """
+    def __init__(self, directory: str, max_bytes: int | None = None):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+        # Rebuild the usage order from the entry modification times
+        entries = []
+        for key in os.listdir(directory):
+            path = os.path.join(directory, key)
+            if os.path.isdir(path) and not key.startswith("."):
+                size = sum(os.path.getsize(os.path.join(path, file)) for file in os.listdir(path))
+                entries.append((os.path.getmtime(path), key, size))
+        self.entries: OrderedDict[str, int] = OrderedDict((key, size) for _, key, size in sorted(entries))
+
+    @staticmethod
+    def key(script: Script) -> str:
+        outputs = {path: f"<output{i}>" for i, path in enumerate(script.outputs())}
+        text = script.serialize(outputs)
+
+        # Report names are usually derived from their (temporary) paths
+        for i, report in enumerate(script.reports()):
+            text = re.sub(rf"\b{re.escape(report.name)}\b", f"<report{i}>", text)
+        return hashlib.sha256(text.encode("ascii")).hexdigest()
+
+    @property
+    def size(self) -> int:
+        return sum(self.entries.values())
+
+    def restore(self, script: Script) -> bool:
+        """Copies cached reports to the script's report paths, returning `False` on a miss"""
+        key = self.key(script)
+        if key not in self.entries:
+            self.misses += 1
+            return False
+
+        entry = os.path.join(self.directory, key)
+        for i, path in enumerate(script.outputs()):
+            shutil.copyfile(os.path.join(entry, str(i)), path)
+        os.utime(entry)
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return True
+
+    def store(self, script: Script):
+        """Adds the reports produced by a completed script to the cache"""
+        key = self.key(script)
+        if key in self.entries:
+            return
+
+        # Stage the entry so a partially copied entry is never visible
+        staging = tempfile.mkdtemp(prefix=".", dir=self.directory)
+        size = 0
+        for i, path in enumerate(script.outputs()):
+            shutil.copyfile(path, os.path.join(staging, str(i)))
+            size += os.path.getsize(path)
+        os.replace(staging, os.path.join(self.directory, key))
+        self.entries[key] = size
+        self.evict()
+
+    def evict(self):
+        if self.max_bytes is None:
+            return
+        total = self.size
+        while total > self.max_bytes and self.entries:
+            key, size = self.entries.popitem(last=False)
+            shutil.rmtree(os.path.join(self.directory, key), ignore_errors=True)
+            total -= size
+
+    def clear(self):
+        while self.entries:
+            key, _ = self.entries.popitem()
+            shutil.rmtree(os.path.join(self.directory, key), ignore_errors=True)
+
+class Journal:
+    """
+    Append-only record of the missions that have been run
+
+    Each line records a mission's identity (its `ResultCache.key`), its status and where its reports were written.
+    Every call to `record` appends its lines with a single locked write, so any number of processes can share a journal,
+    and a line left incomplete by a crash is ignored when the journal is read.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self._entries: dict[str, dict] | None = None
+
+    def record(self, results: list[tuple[Script, RunStatus]]):
+        lines = []
+        for script, status in results:
+            # Journal the final report paths of redirected scripts
+            originals = {redirect: path for path, redirect in script.redirects.items()}
+            outputs = [originals.get(path, path) for path in script.outputs()]
+            lines.append(json.dumps({"key": ResultCache.key(script), "status": status.name, "outputs": outputs, "time": time.time()}) + "\n")
+        data = "".join(lines).encode("utf-8")
+        if not data:
+            return
+
+        fd = os.open(self.path, os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            if os.name == "posix":
+                import fcntl
+                fcntl.flock(fd, fcntl.LOCK_EX)
+
+            # Terminate a line left incomplete by a writer that crashed
+            size = os.fstat(fd).st_size
+            if size:
+                os.lseek(fd, size - 1, os.SEEK_SET)
+                if os.read(fd, 1) != b"\n":
+                    data = b"\n" + data
+            while data:
+                data = data[os.write(fd, data):]
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def entries(self, reload: bool = False) -> dict[str, dict]:
+        """The latest entry for each mission"""
+        if self._entries is None or reload:
+            self._entries = {}
+            if os.path.exists(self.path):
+                with open(self.path, "r", encoding="utf-8") as file:
+                    for line in file:
+                        try:
+                            entry = json.loads(line)
+                        except ValueError:
+                            continue
+                        self._entries[entry["key"]] = entry
+        return self._entries
+
+    def restore(self, script: Script) -> bool:
+        """Copies the journaled reports of a completed mission to the script's report paths, returning `False` if it must be run"""
+        entry = self.entries().get(ResultCache.key(script))
+        if entry is None or entry["status"] != RunStatus.COMPLETED.name:
+            return False
+        if not all(os.path.exists(path) for path in entry["outputs"]):
+            return False
+        for source, path in zip(entry["outputs"], script.outputs()):
+            if os.path.abspath(source) != os.path.abspath(path):
+                shutil.copyfile(source, path)
+        return True
+
+def _cmdlet() -> str | None:
+    if os.name == "nt":
+        return "GmatConsole.exe"
+    elif os.name == "posix":
+        return "GmatConsole"
+    return None
+
+def _command(cmdlet: str, logfile: str, mode: str, path: str) -> list[str]:
+    return [cmdlet, "--verbose", "off", "--logfile", logfile, mode, path]
+
+def _group() -> dict:
+    """Popen arguments that start GMAT in its own process group"""
+    if os.name == "nt":
+        return {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+    return {"start_new_session": True}
+
+# Directory in which a pool worker records the process group of each GMAT run, so that the pool can kill them
+_registry: str | None = None
+
+def _start(command: list[str]) -> subprocess.Popen:
+    """Starts GMAT in its own process group, registering it before a terminated pool worker can die"""
+    if _registry is None:
+        return subprocess.Popen(command, stdout=subprocess.DEVNULL, **_group())
+    if os.name != "posix":
+        process = subprocess.Popen(command, stdout=subprocess.DEVNULL, **_group())
+        open(os.path.join(_registry, str(process.pid)), "w").close()
+        return process
+
+    # SIGTERM is held off until the run is registered, and unblocked again in GMAT itself
+    import signal
+    previous = signal.pthread_sigmask(signal.SIG_BLOCK, {signal.SIGTERM})
+    try:
+        process = subprocess.Popen(command, stdout=subprocess.DEVNULL, preexec_fn=lambda: signal.pthread_sigmask(signal.SIG_SETMASK, previous), **_group())
+        open(os.path.join(_registry, str(process.pid)), "w").close()
+    finally:
+        signal.pthread_sigmask(signal.SIG_SETMASK, previous)
+    return process
+
+def _untrack(process: subprocess.Popen):
+    if _registry is not None:
+        try:
+            os.remove(os.path.join(_registry, str(process.pid)))
+        except FileNotFoundError:
+            pass
+
+def _kill_tree(pid: int):
+    """Kills a GMAT process along with any processes it started"""
+    if os.name == "nt":
+        subprocess.run(["taskkill", "/F", "/T", "/PID", str(pid)], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    else:
+        import signal
+        try:
+            os.killpg(pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+
+def _execute(command: list[str], timeout: float | None) -> int | None:
+    """Runs GMAT to completion, returning `None` if it had to be killed after `timeout` seconds"""
+    process = _start(command)
+    try:
+        return process.wait(timeout)
+    except subprocess.TimeoutExpired:
+        _kill_tree(process.pid)
+        process.wait()
+        return None
+    except BaseException:
+        _kill_tree(process.pid)
+        raise
+    finally:
+        _untrack(process)
+
+class RunHandle:
+    """A GMAT run started in the background with `Dispatch.start`"""
+    def __init__(self, command: list[str], script: str, logfile: str, timeout: float | None):
+        self.script = script
+        self.logfile = logfile
+        self.timeout = timeout
+        self.deadline = time.monotonic() + timeout if timeout is not None else None
+        self.timed_out = False
+        self.process = _start(command)
+
+    def running(self) -> bool:
+        """Whether GMAT is still running, killing it if it has run past its timeout"""
+        if self.process.poll() is not None:
+            _untrack(self.process)
+            return False
+        if self.deadline is not None and time.monotonic() > self.deadline:
+            self.timed_out = True
+            self.kill()
+            return False
+        return True
+
+    def kill(self):
+        """Stops the run, along with any processes GMAT started"""
+        if self.process.poll() is None:
+            _kill_tree(self.process.pid)
+        self.process.wait()
+        _untrack(self.process)
+
+    def wait(self):
+        """Waits for GMAT to exit, raising the same errors as `Dispatch.run` if it did not succeed"""
+        if not self.timed_out:
+            remaining = None if self.deadline is None else max(0.0, self.deadline - time.monotonic())
+            try:
+                self.process.wait(remaining)
+            except subprocess.TimeoutExpired:
+                self.timed_out = True
+            except BaseException:
+                self.kill()
+                raise
+        self.kill()
+        if self.timed_out:
+            raise DispatchTimeout(self.script, self.timeout, self.logfile)
+        if self.process.returncode != 0:
+            raise DispatchError(self.script, self.process.returncode, self.logfile)
+
+def _worker_init(registry: str):
+    global _registry
+    _registry = registry
+
+def _kill_registered(registry: str):
+    """Kills the GMAT runs left behind by terminated pool workers"""
+    for name in os.listdir(registry):
+        _kill_tree(int(name))
+
+@contextmanager
+def _batch_file(files: list[str], directory: str | None = None):
+    with tempfile.NamedTemporaryFile(suffix=".batch", dir=directory, delete=False) as batch:
+        for file in files:
+            batch.write((file + "\n").encode('ascii'))
+        batch.close()
+        try:
+            yield batch.name
+        finally:
+            os.remove(batch.name)
+
+class _MarkedScript(Script):
+    """
+    The lines of another script, ending its mission by writing to a marker file
+
+    Works on the text so that scripts rendered without their `resources` and `mission`, such as
+    template variants and packed scripts, are marked too.
+    """
+    def __init__(self, script: Script, marker: str):
+        super().__init__([], [])
+        self.script = script
+        self.report = ReportFile("IsolateMarker", marker, headers=False)
+
+    def _lines(self) -> Iterator[str]:
+        # The marker's resources go before the mission sequence, and its report after the last step
+        resources = "\n".join([_MARKER_VARIABLE.to_gmat_script(), self.report.to_gmat_script(), ""])
+        pending = True
+        for piece in self.script.iter_lines():
+            begin = _BEGIN_MISSION.search(piece) if pending else None
+            if begin is not None:
+                piece = piece[:begin.start()] + resources + "\n" + piece[begin.start():]
+                pending = False
+            yield piece
+        if pending:
+            yield resources
+            yield "BeginMissionSequence;"
+        yield ""
+        yield Report(self.report, [_MARKER_VARIABLE.name]).to_gmat_script()
+
 class Dispatch:
-    def __init__(self, logfile: str):
-        if os.name == "nt":
-            self.cmdlet = "GmatConsole.exe"
-        elif os.name == "posix":
-            self.cmdlet = "GmatConsole"
+    """
+    Runs GMAT scripts through GmatConsole
+
+    Temporary scripts and batch files are written to `directory`, or the system temporary directory if it is not provided.
+    GMAT is killed, along with any processes it started, if a script runs longer than `timeout` seconds
+    or a batch runs longer than `batch_timeout` seconds (by default `timeout` for each script in the batch).
+    """
+    def __init__(self, logfile: str, cache: ResultCache | None = None, directory: str | None = None, timeout: float | None = None, batch_timeout: float | None = None):
+        self.cmdlet = _cmdlet()
 
         if not os.path.exists(logfile):
             raise ValueError("Provided path too logfile is not valid")
         self.logfile = logfile
+        self.cache = cache
+        self.directory = directory
+        self.timeout = timeout
+        self.batch_timeout = batch_timeout
     
-    def run(self, script: str):
-        code = subprocess.run([self.cmdlet, "--verbose", "off", "--logfile", self.logfile, "--run", script], stdout=subprocess.DEVNULL).returncode
+    def run(self, script: str, timeout: float | None = None):
+        timeout = timeout if timeout is not None else self.timeout
+        code = _execute(_command(self.cmdlet, self.logfile, "--run", script), timeout)
+        if code is None:
+            raise DispatchTimeout(script, timeout, self.logfile)
         if code != 0:
             raise DispatchError(script, code, self.logfile)
         
     def build_and_run(self, script: Script):
-        with script.as_temp_file() as file:
+        if self.cache is not None and self.cache.restore(script):
+            return
+        with script.as_temp_file(self.directory) as file:
             self.run(file)
+        if self.cache is not None:
+            self.cache.store(script)
+
+    def start(self, script: str, timeout: float | None = None) -> RunHandle:
+        """Starts running a script without waiting for it to finish"""
+        timeout = timeout if timeout is not None else self.timeout
+        return RunHandle(_command(self.cmdlet, self.logfile, "--run", script), script, self.logfile, timeout)
+
+    def follow(self, script: Script, report: ReportFile | ReportReader, interval: float = 0.1) -> Iterator[dict[str, float]]:
+        """
+        Runs a script, yielding the rows of one of its reports while GMAT is still writing them
+
+        Closing the generator early, such as once the rows show a decayed orbit, kills the run; use
+        `contextlib.closing` or call `close()` rather than relying on garbage collection to do so.
+        A run that fails raises once its rows have been yielded. Only runs that finish are cached.
+        """
+        path = script.outputs()[script.reports().index(report)]
+        if self.cache is not None and self.cache.restore(script):
+            yield from parse_report(path)
+            return
+
+        with script.as_temp_file(self.directory) as file:
+            # Start from an empty report rather than following one left by an earlier run
+            for output in script.outputs():
+                open(output, "w").close()
+            handle = self.start(file)
+            try:
+                yield from follow_report(path, handle.running, interval)
+                handle.wait()
+            finally:
+                handle.kill()
+        if self.cache is not None:
+            self.cache.store(script)
 
-    def batch(self, batch: str):
+    def batch(self, batch: str, timeout: float | None = None):
         # Run the batch file
-        code = subprocess.run([self.cmdlet, "--verbose", "off", "--logfile", self.logfile, "--batch", batch], stdout=subprocess.DEVNULL).returncode
+        code = _execute(_command(self.cmdlet, self.logfile, "--batch", batch), timeout)
 
         # Check for errors
+        if code is None:
+            raise DispatchTimeout(None, timeout, self.logfile)
         if code != 0:
             raise DispatchError(None, code, self.logfile)
         
-    def build_and_run_batch(self, scripts: list[Script]):
+    def _run_batch(self, scripts: list[Script]):
+        timeout = self.batch_timeout
+        if timeout is None and self.timeout is not None:
+            timeout = self.timeout * len(scripts)
+
         from contextlib import ExitStack
         with ExitStack() as stack:
-            files = [stack.enter_context(script.as_temp_file()) for script in scripts]
-            with tempfile.NamedTemporaryFile(suffix=".batch", delete=False) as batch:
-                for file in files:
-                    batch.write((file + "\n").encode('ascii'))
-                batch.close()
-                self.batch(batch.name)
+            files = [stack.enter_context(script.as_temp_file(self.directory)) for script in scripts]
+            with _batch_file(files, self.directory) as batch:
+                self.batch(batch, timeout)
+
+    def _retain_log(self, error: DispatchError) -> DispatchError:
+        """Copies the log of a failed run so that later runs do not overwrite it"""
+        with tempfile.NamedTemporaryFile(suffix=".log", dir=self.directory, delete=False) as log:
+            log.close()
+            shutil.copyfile(self.logfile, log.name)
+        error.log = log.name
+        return error
+
+    def _isolate(self, scripts: list[Script]) -> list[DispatchError | None]:
+        """
+        Runs the scripts as a batch, rerunning only the scripts that did not finish if the batch fails
+
+        Each script in a batch ends its mission by writing to its own marker file. GMAT stops a batch at the first
+        failing script, so that is the first script without a marker; it is rerun on its own to capture its error,
+        and the scripts after it are retried as a smaller batch.
+        """
+        errors: list[DispatchError | None] = [None] * len(scripts)
+        attempts = [list(range(len(scripts)))]
+        with tempfile.TemporaryDirectory(dir=self.directory) as markers:
+            while attempts:
+                indices = attempts.pop()
+                if len(indices) == 1:
+                    with scripts[indices[0]].as_temp_file(self.directory) as file:
+                        try:
+                            self.run(file)
+                        except DispatchError as e:
+                            errors[indices[0]] = self._retain_log(e)
+                    continue
+
+                # Clear out any markers from earlier attempts
+                paths = [os.path.join(markers, f"{index}.txt") for index in indices]
+                for path in paths:
+                    open(path, "w").close()
+
+                try:
+                    self._run_batch([_MarkedScript(scripts[index], path) for index, path in zip(indices, paths)])
+                    continue
+                except DispatchError:
+                    pass
+
+                # A failure after the last marker is blamed on the last script
+                failed = next((i for i, path in enumerate(paths) if os.path.getsize(path) == 0), len(indices) - 1)
+                if failed + 1 < len(indices):
+                    attempts.append(indices[failed + 1:])
+                attempts.append([indices[failed]])
+        return errors
+
+    def build_and_run_batch(self, scripts: list[Script], isolate: bool = False) -> list[MissionResult]:
+        """
+        Runs the scripts in a single GMAT instance and returns the status of each
+
+        If `isolate` is set, a failing script does not fail the batch; see `MissionResult.error` for what went wrong.
+        """
+        results = [MissionResult(i, script) for i, script in enumerate(scripts)]
+        if self.cache is not None:
+            for result in results:
+                if self.cache.restore(result.script):
+                    result.status = RunStatus.CACHED
+        pending = [result for result in results if result.status != RunStatus.CACHED]
+        if not pending:
+            return results
+
+        if isolate:
+            errors = self._isolate([result.script for result in pending])
+            for result, error in zip(pending, errors):
+                if error is not None:
+                    result.status = _status(error)
+                    result.error = error
+        else:
+            self._run_batch([result.script for result in pending])
+
+        if self.cache is not None:
+            for result in pending:
+                if result.status == RunStatus.COMPLETED:
+                    self.cache.store(result.script)
+        return results
+
+class DispatchResult:
+    """
+    The outcome of a single GMAT invocation
+
+    A log that `AsyncDispatch` created for the run is removed as soon as the run succeeds, leaving `log` as `None`,
+    and is otherwise kept for inspection until `cleanup()` is called or the result is used as a context manager.
+    """
+    def __init__(self, script: str | None, code: int | None, log: str | None, timeout: float | None = None, owns_log: bool = False):
+        self.script = script
+        self.code = code
+        self.log = log
+        self.timeout = timeout
+        self.owns_log = owns_log
+        if owns_log and code == 0:
+            self.cleanup()
+
+    def cleanup(self):
+        """Removes the log if it was created for this run"""
+        if self.owns_log and self.log is not None:
+            if os.path.exists(self.log):
+                os.remove(self.log)
+            self.log = None
+
+    def __enter__(self) -> "DispatchResult":
+        return self
+
+    def __exit__(self, *args):
+        self.cleanup()
+
+    @property
+    def timed_out(self) -> bool:
+        return self.code is None
+
+    @property
+    def ok(self) -> bool:
+        return self.code == 0
+
+    def check(self):
+        """Raises a `DispatchError` if GMAT returned a non-zero code or was killed"""
+        if self.code is None:
+            raise DispatchTimeout(self.script, self.timeout, self.log)
+        if self.code != 0:
+            raise DispatchError(self.script, self.code, self.log)
+
+class AsyncDispatch:
+    """
+    Runs GMAT on an asyncio event loop
+
+    At most `limit` GmatConsole processes run at once; additional runs wait for a free slot.
+    Each run writes to its own logfile in `directory` unless one is provided (see `DispatchResult` for when it is removed).
+    Runs that take longer than `timeout` seconds are killed and return a result with no code.
+    """
+    def __init__(self, limit: int | None = None, directory: str | None = None, timeout: float | None = None):
+        if limit is not None and limit < 1:
+            raise ValueError("Limit must be `None` or greater than zero")
+        self.cmdlet = _cmdlet()
+        self.limit = limit or os.cpu_count() or 1
+        self.semaphore = asyncio.Semaphore(self.limit)
+        self.directory = directory
+        self.timeout = timeout
+
+    async def _execute(self, mode: str, path: str, logfile: str | None, timeout: float | None = None) -> DispatchResult:
+        owns_log = logfile is None
+        if owns_log:
+            with tempfile.NamedTemporaryFile(suffix=".log", dir=self.directory, delete=False) as log:
+                logfile = log.name
+        timeout = timeout if timeout is not None else self.timeout
+        try:
+            async with self.semaphore:
+                process = await asyncio.create_subprocess_exec(*_command(self.cmdlet, logfile, mode, path), stdout=subprocess.DEVNULL, **_group())
+                try:
+                    code = await asyncio.wait_for(process.wait(), timeout)
+                except asyncio.TimeoutError:
+                    _kill_tree(process.pid)
+                    await process.wait()
+                    code = None
+                except BaseException:
+                    _kill_tree(process.pid)
+                    raise
+        except BaseException:
+            if owns_log and os.path.exists(logfile):
+                os.remove(logfile)
+            raise
+        return DispatchResult(path if mode == "--run" else None, code, logfile, timeout, owns_log)
+
+    async def run(self, script: str, logfile: str | None = None) -> DispatchResult:
+        return await self._execute("--run", script, logfile)
+
+    async def build_and_run(self, script: Script, logfile: str | None = None) -> DispatchResult:
+        with script.as_temp_file(self.directory) as file:
+            return await self.run(file, logfile)
+
+    async def batch(self, batch: str, logfile: str | None = None, timeout: float | None = None) -> DispatchResult:
+        return await self._execute("--batch", batch, logfile, timeout)
+
+    async def build_and_run_batch(self, scripts: list[Script], logfile: str | None = None) -> DispatchResult:
+        from contextlib import ExitStack
+        with ExitStack() as stack:
+            files = [stack.enter_context(script.as_temp_file(self.directory)) for script in scripts]
+            with _batch_file(files, self.directory) as batch:
+                timeout = self.timeout * len(scripts) if self.timeout is not None else None
+                return await self.batch(batch, logfile, timeout)
+
+    async def run_all(self, scripts: list[Script]) -> list[DispatchResult]:
+        """Runs every script concurrently and returns the results in order"""
+        return list(await asyncio.gather(*(self.build_and_run(script) for script in scripts)))
 
 @contextmanager
-def dispatch_instance():
-    """Creates a temporary logfile and yields a dispatch instance"""
-    with tempfile.NamedTemporaryFile(suffix=".log", delete=False) as logfile:
+def dispatch_instance(cache: ResultCache | None = None, directory: str | None = None, timeout: float | None = None):
+    """
+    Creates a temporary logfile and yields a dispatch instance
+
+    The logfile is removed on exit unless an error escapes, so that it can still be inspected.
+    """
+    with tempfile.NamedTemporaryFile(suffix=".log", dir=directory, delete=False) as logfile:
         logfile.close()
-        try:
-            yield Dispatch(logfile.name)
-        finally:
-            pass
+        yield Dispatch(logfile.name, cache, directory, timeout)
+        os.remove(logfile.name)
+
+def _batch_process(scripts: list[Script], isolate: bool = False, directory: str | None = None, timeout: float | None = None) -> list[DispatchError | None]:
+    with dispatch_instance(directory=directory, timeout=timeout) as dispatch:
+        return [result.error for result in dispatch.build_and_run_batch(scripts, isolate)]
+
+def _status(error: DispatchError | None) -> RunStatus:
+    if error is None:
+        return RunStatus.COMPLETED
+    return RunStatus.TIMEOUT if isinstance(error, DispatchTimeout) else RunStatus.FAILED
+
+def _parse_outputs(script: Script) -> dict[str, dict]:
+    """The columns of each report reader of a script, by report name"""
+    return {report.name: parse_report_columns(path) for report, path in zip(script.reports(), script.outputs()) if isinstance(report, ReportReader)}
 
-def _batch_process(scripts: list[Script]):
-    with dispatch_instance() as dispatch:
-        dispatch.build_and_run_batch(scripts)
+def _indexed_batch_process(batch: list[tuple[int, Script]], isolate: bool, directory: str | None, timeout: float | None, journal: Journal | None, parse: bool = False) -> tuple[list[tuple[int, DispatchError | None, dict[str, dict] | None]], float]:
+    start = time.perf_counter()
+    errors = _batch_process([script for _, script in batch], isolate, directory, timeout)
+    if journal is not None:
+        journal.record([(script, _status(error)) for (_, script), error in zip(batch, errors)])
+
+    # Parsing here spreads it across the pool; the arrays are sent back with the result
+    data = [_parse_outputs(script) if parse and error is None else None for (_, script), error in zip(batch, errors)]
+    return [(index, error, columns) for (index, _), error, columns in zip(batch, errors, data)], time.perf_counter() - start
 
 from multiprocessing import Pool
+from collections import deque
+from queue import Queue
 
-def parallel_process(missions: list[Script], threads: int | None = None):
+class CostModel:
     """
-    Batch process a set of missions in parallel
-    
+    Estimates how long a script takes to run
+
+    A script's cost is the number of integration steps it is expected to take, weighted by the cost of the force model.
+    Propagations are assumed to last as long as their `ElapsedSecs`/`ElapsedDays` termination condition
+    (or `default_duration` seconds otherwise) and to step at the propagator's `max_step`, shortened for tighter accuracies.
+    Loops multiply the cost of their contents, as do target blocks by `target_iterations` per varied parameter.
+    Template parameters take the values of a `TemplateVariant`; any other value that is not a number is ignored.
+
+    Costs are calibrated to seconds with the recorded run times, and scripts that have already been run
+    are estimated from their own run time.
+    """
+    def __init__(self, default_duration: float = 86400.0, target_iterations: int = 5, path: str | None = None):
+        self.default_duration = default_duration
+        self.target_iterations = target_iterations
+        self.path = path
+        self.timings: dict[str, float] = {}
+        self.scale = 1.0
+        self._seconds = 0.0
+        self._cost = 0.0
+
+        if path is not None and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as file:
+                state = json.load(file)
+            self.timings = state["timings"]
+            self._seconds = state["seconds"]
+            self._cost = state["cost"]
+            if self._cost > 0:
+                self.scale = self._seconds / self._cost
+
+    def save(self):
+        if self.path is None:
+            raise ValueError("Cost model has no path")
+        with open(self.path, "w", encoding="utf-8") as file:
+            json.dump({"timings": self.timings, "seconds": self._seconds, "cost": self._cost}, file)
+
+    @staticmethod
+    def _number(value, values: dict) -> float | None:
+        """A number of a script, with template parameters filled in from `values`, or `None` if it is not known"""
+        if isinstance(value, Param):
+            value = values.get(value.name)
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return None
+
+    def _propagate_cost(self, step: Propagate, values: dict) -> float:
+        duration = None
+        for parameter, value in step.termination:
+            value = self._number(value, values)
+            if value is None:
+                continue
+            if parameter.endswith(".ElapsedSecs"):
+                duration = abs(value)
+            elif parameter.endswith(".ElapsedDays"):
+                duration = abs(value) * 86400.0
+        if duration is None:
+            duration = self.default_duration
+
+        # Settings that are not known fall back to GMAT's defaults
+        prop: Propagator = step.prop
+        max_step = self._number(prop.max_step, values) or 2700.0
+        accuracy = self._number(prop.accuracy, values) or 1e-11
+        steps = duration / max_step * (accuracy / 1e-11) ** (-1 / 9) + 1
+
+        model = prop.force_model
+        degree = self._number(model.gravity_field.degree, values) or 0.0
+        order = self._number(model.gravity_field.order, values) or 0.0
+        evaluation = 1.0 + degree * order / 16 + 0.1 * len(model.point_masses)
+        return steps * evaluation * len(step.sats)
+
+    def _cost_of(self, steps: list[MissionStep], values: dict) -> float:
+        cost = 0.0
+        for step in steps:
+            if isinstance(step, Propagate):
+                cost += self._propagate_cost(step, values)
+            elif isinstance(step, MissionLogic):
+                contents = self._cost_of(step.contents, values)
+                if isinstance(step, ForLoop):
+                    start, increment, end = (self._number(bound, values) for bound in (step.start, step.step, step.end))
+                    if None not in (start, increment, end):
+                        contents *= max(0, int((end - start) / increment) + 1) if increment else 0
+                elif isinstance(step, TargetBlock) and step.solvemode == SolverMode.Solve:
+                    varies = sum(isinstance(content, Vary) for content in step.contents)
+                    contents *= self.target_iterations * (1 + varies)
+                cost += contents
+        return cost
+
+    def cost(self, script: Script) -> float:
+        """The uncalibrated cost of the script; a packed script costs as much as its members"""
+        from .packing import PackedScript
+        if isinstance(script, PackedScript):
+            return sum(self.cost(member) for member in script.members)
+        values = script.values if isinstance(script, TemplateVariant) else {}
+        return self._cost_of(script.mission, values) + 1.0
+
+    def estimate(self, script: Script) -> float:
+        """The expected run time of the script in seconds"""
+        key = ResultCache.key(script)
+        if key in self.timings:
+            return self.timings[key]
+        return self.cost(script) * self.scale
+
+    def record(self, scripts: list[Script], seconds: float):
+        """Records the run time of a batch, shared out between its scripts by their cost"""
+        costs = [self.cost(script) for script in scripts]
+        total = sum(costs)
+        for script, cost in zip(scripts, costs):
+            self.timings[ResultCache.key(script)] = seconds * cost / total
+        self._seconds += seconds
+        self._cost += total
+        self.scale = self._seconds / self._cost
+
+class BatchSizer:
+    """
+    Sizes batches from the observed cost of running them
+
+    Every batch is modelled as `startup + count * per_script` seconds, with both terms fitted to the completed batches.
+    Batches are made large enough that GmatConsole startup is at most `overhead` of a batch's run time,
+    but never larger than an even share of the remaining missions or than `max_batch_seconds` worth of scripts.
+    """
+    def __init__(self, max_batch_seconds: float | None = None, overhead: float = 0.1):
+        if max_batch_seconds is not None and max_batch_seconds <= 0:
+            raise ValueError("Maximum batch seconds must be `None` or greater than zero")
+        if not 0 < overhead < 1:
+            raise ValueError("Overhead must be between zero and one")
+        self.max_batch_seconds = max_batch_seconds
+        self.overhead = overhead
+        self.observations: list[tuple[int, float]] = []
+        self.issued = 0
+
+    def record(self, count: int, seconds: float):
+        self.observations.append((count, seconds))
+
+    def estimate(self) -> tuple[float, float] | None:
+        """The fitted `(startup, per_script)` times, or `None` until batches of two different sizes have completed"""
+        n = len(self.observations)
+        mean_count = sum(count for count, _ in self.observations) / n if n else 0.0
+        mean_seconds = sum(seconds for _, seconds in self.observations) / n if n else 0.0
+        variance = sum((count - mean_count) ** 2 for count, _ in self.observations)
+        if variance == 0:
+            return None
+        covariance = sum((count - mean_count) * (seconds - mean_seconds) for count, seconds in self.observations)
+        per_script = max(covariance / variance, 0.0)
+        startup = max(mean_seconds - per_script * mean_count, 0.0)
+        return startup, per_script
+
+    def size(self, remaining: int, workers: int) -> int:
+        share = max(1, -(-remaining // workers))
+        estimate = self.estimate()
+        if estimate is None:
+            # Alternate between single and double batches until the startup cost can be separated out
+            self.issued += 1
+            return min(share, 1 + self.issued % 2)
+
+        startup, per_script = estimate
+        if per_script == 0:
+            size = share
+        else:
+            size = math.ceil(startup * (1 - self.overhead) / (self.overhead * per_script))
+            if self.max_batch_seconds is not None:
+                size = min(size, int((self.max_batch_seconds - startup) / per_script))
+        return max(1, min(size, share))
+
+def _staging(path: str, attempt: int) -> str:
+    return f"{path}.attempt{attempt}"
+
+def _keep_log(error: BaseException, workspace: str, directory: str | None):
+    """Moves the log of a failed mission out of the pool's workspace before it is removed"""
+    if not isinstance(error, DispatchError) or os.path.dirname(os.path.abspath(error.log)) != os.path.abspath(workspace):
+        return
+    with tempfile.NamedTemporaryFile(suffix=".log", dir=directory, delete=False) as log:
+        log.close()
+        shutil.move(error.log, log.name)
+    error.log = log.name
+
+def imap_process(missions: list[Script], threads: int | None = None, batch_size: int | None = None, cache: ResultCache | None = None, max_batch_seconds: float | None = None, isolate: bool = False, directory: str | None = None, timeout: float | None = None, speculate: bool = False, journal: Journal | None = None, cost_model: CostModel | None = None, parse: bool = False) -> Iterator[MissionResult]:
+    """
+    Batch process a set of missions in parallel, yielding each mission as it completes
+
+    Missions are handed out `batch_size` at a time to whichever worker is idle, so a slow batch only holds up its own worker.
+    Results are yielded in completion order; use `MissionResult.index` to recover the position in `missions`.
+    If `batch_size` is not provided, batches are sized by a `BatchSizer` from the run times of completed batches,
+    with `max_batch_seconds` capping the expected duration of each batch.
+    Missions found in `cache` are restored and yielded before any worker is started.
+    If `isolate` is set, a failing mission is yielded with its error instead of aborting the sweep (see `Dispatch.build_and_run_batch`).
+    Workers write their scripts and logs to a `RunWorkspace` in `directory`, which is removed once the sweep ends,
+    along with anything left by terminated workers; the logs of failed missions are moved to `directory` first.
+    Each script is killed after `timeout` seconds; combine with `isolate` to report timeouts instead of raising them.
+
+    If `speculate` is set, workers left idle at the end of the sweep start a second copy of the longest running batches.
+    Whichever copy finishes first provides the reports, and the other is killed once the sweep is complete.
+    Both copies write their reports next to the originals and the winner's are moved into place.
+
+    Workers record every mission they run in `journal`. Missions that the journal shows as completed,
+    with their reports still in place, are restored and yielded as resumed instead of being run again.
+
+    With a `cost_model`, missions are started longest-expected-first so that the longest runs do not start last,
+    and the model is updated with the run time of every batch.
+
+    If `parse` is set, the worker that ran a mission also parses its `ReportReader` outputs into arrays
+    (see `parse_report_columns`) and sends them back on `MissionResult.data`, so parsing scales with the pool.
+
     Warning
     -------
     main script must have `if __name__ == "__main__":`
@@ -86,15 +916,131 @@ def parallel_process(missions: list[Script], threads: int | None = None):
         raise ValueError("Threads must be `None` or greater than zero")
 
     if threads is None:
-        import os
         threads = os.cpu_count() or 1
 
-    # Divide missions into roughly equal chunks
-    def split_list(lst, n):
-        k, m = divmod(len(lst), n)
-        return [lst[i * k + min(i, m):(i + 1) * k + min(i + 1, m)] for i in range(n)]
+    if batch_size is not None and batch_size < 1:
+        raise ValueError("Batch size must be `None` or greater than zero")
+
+    # Workers record into their own copies of the journal, so reread whatever they wrote in earlier sweeps
+    if journal is not None:
+        journal.entries(reload=True)
+
+    pending = deque()
+    for index, mission in enumerate(missions):
+        if journal is not None and journal.restore(mission):
+            yield MissionResult(index, mission, RunStatus.RESUMED, data=_parse_outputs(mission) if parse else None)
+        elif cache is not None and cache.restore(mission):
+            yield MissionResult(index, mission, RunStatus.CACHED, data=_parse_outputs(mission) if parse else None)
+        else:
+            pending.append((index, mission))
+
+    if not pending:
+        return
+
+    if cost_model is not None:
+        pending = deque(sorted(pending, key=lambda item: cost_model.estimate(item[1]), reverse=True))
+
+    sizer = BatchSizer(max_batch_seconds)
+    completed = Queue()
+
+    # Unfinished batches in the order they were started, and how many copies of each have been started
+    batches: dict[int, list[tuple[int, Script]]] = {}
+    copies: dict[int, int] = {}
+    staged: set[str] = set()
+
+    from contextlib import ExitStack
+    from .workspace import RunWorkspace
+    try:
+        with ExitStack() as stack:
+            # Terminating the pool kills its workers outright, so the GMAT runs they registered are killed
+            # and their files removed from here, in that order, once the pool has shut down
+            workspace = stack.enter_context(RunWorkspace(directory))
+            registry = workspace.path("gmat")
+            os.mkdir(registry)
+            stack.callback(_kill_registered, registry)
+            pool = stack.enter_context(Pool(threads, initializer=_worker_init, initargs=(registry,)))
+
+            def submit(batch_id: int):
+                attempt = copies[batch_id]
+                copies[batch_id] += 1
+                batch = batches[batch_id]
+                if speculate:
+                    redirects = [{path: _staging(path, attempt) for path in script.outputs()} for _, script in batch]
+                    staged.update(*(redirect.values() for redirect in redirects))
+                    batch = [(index, script.redirected(redirect)) for (index, script), redirect in zip(batch, redirects)]
+                pool.apply_async(_indexed_batch_process, (batch, isolate, workspace.directory, timeout, journal, parse),
+                                 callback=lambda result: completed.put((batch_id, attempt, result)),
+                                 error_callback=lambda error: completed.put((batch_id, attempt, error)))
+
+            def refill() -> bool:
+                if pending:
+                    size = batch_size if batch_size is not None else sizer.size(len(pending), threads)
+                    batch_id = len(copies)
+                    batches[batch_id] = [pending.popleft() for _ in range(min(size, len(pending)))]
+                    copies[batch_id] = 0
+                    submit(batch_id)
+                    return True
+                if speculate:
+                    for batch_id in batches:
+                        if copies[batch_id] == 1:
+                            submit(batch_id)
+                            return True
+                return False
+
+            # Give every worker something to do
+            outstanding = 0
+            while outstanding < threads and refill():
+                outstanding += 1
+
+            while batches:
+                batch_id, attempt, result = completed.get()
+                outstanding -= 1
+
+                # Ignore copies that lost the race
+                batch = batches.pop(batch_id, None)
+                if batch is not None:
+                    if isinstance(result, BaseException):
+                        _keep_log(result, workspace.directory, directory)
+                        raise result
+                    errors, seconds = result
+                    sizer.record(len(errors), seconds)
+                    if cost_model is not None:
+                        cost_model.record([missions[index] for index, _ in batch], seconds)
+                    if speculate:
+                        for path in (path for _, script in batch for path in script.outputs()):
+                            if os.path.exists(_staging(path, attempt)):
+                                os.replace(_staging(path, attempt), path)
 
-    blocks = split_list(missions, threads)
+                # Refill the idle worker before handing results back
+                while outstanding < threads and refill():
+                    outstanding += 1
 
-    with Pool(threads) as p:
-        p.map(_batch_process, blocks)
+                if batch is None:
+                    continue
+                for index, error, data in errors:
+                    if error is not None:
+                        _keep_log(error, workspace.directory, directory)
+                        yield MissionResult(index, missions[index], _status(error), error)
+                        continue
+                    if cache is not None:
+                        cache.store(missions[index])
+                    yield MissionResult(index, missions[index], data=data)
+    finally:
+        for path in staged:
+            if os.path.exists(path):
+                os.remove(path)
+
+def parallel_process(missions: list[Script], threads: int | None = None, batch_size: int | None = None, cache: ResultCache | None = None, max_batch_seconds: float | None = None, isolate: bool = False, directory: str | None = None, timeout: float | None = None, speculate: bool = False, journal: Journal | None = None, cost_model: CostModel | None = None, parse: bool = False) -> list[MissionResult]:
+    """
+    Batch process a set of missions in parallel
+    
+    See `imap_process` for how missions are distributed across workers.
+    Returns the result of each mission in the order of `missions`.
+
+    Warning
+    -------
+    main script must have `if __name__ == "__main__":`
+
+    If it is not included in the main script, the process will not `fork()` correctly. 
+    """
+    return sorted(imap_process(missions, threads, batch_size, cache, max_batch_seconds, isolate, directory, timeout, speculate, journal, cost_model, parse), key=lambda result: result.index)
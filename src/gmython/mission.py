@@ -1,4 +1,5 @@
 from abc import abstractmethod
+from .resources.resource import Resource
 from .resources.prop import Propagator
 from .resources.spacecraft import Spacecraft
 from .resources.variable import Variable
@@ -7,6 +8,7 @@ from .resources.celestial import CelestialBody
 from .resources.solvers import DifferentialCorrector
 from .resources.burns import ImpulseiveBurn
 from enum import Enum
+from typing import Iterator
 
 class Comparison(Enum):
     EQUAL = 1,
@@ -23,6 +25,16 @@ class Comparison(Enum):
         else:
             raise Exception("Unhandled comparison")
 
+    def evaluate(self, left: float, right: float) -> bool:
+        if self == Comparison.EQUAL:
+            return left == right
+        elif self == Comparison.LESS_THAN:
+            return left < right
+        elif self == Comparison.GREATER_THAN:
+            return left > right
+        else:
+            raise Exception("Unhandled comparison")
+
 class Condition:
     def __init__(self, parameter: str, comparison: Comparison, value: float):
         self.parameter = parameter
@@ -31,8 +43,14 @@ class Condition:
 
     def serialize(self) -> str:
         return f"{self.parameter} {self.comparison.serialize()} {self.value}"
+
+    def evaluate(self, value: float) -> bool:
+        """Whether a value of the parameter meets the condition"""
+        return self.comparison.evaluate(value, self.value)
     
 class MissionStep:
+    __slots__ = ("verb", "description")
+
     def __init__(self, verb, description = "") -> None:
         self.verb = verb
         self.description = description
@@ -41,6 +59,14 @@ class MissionStep:
     def to_gmat_script(self) -> str:
         pass
 
+    def iter_gmat_script(self) -> Iterator[str]:
+        """Yields the lines of the step (steps may yield several lines at once)"""
+        yield self.to_gmat_script()
+
+    def resources(self) -> list[Resource]:
+        """Resources referenced by the step"""
+        return []
+
     def preamble(self) -> str:
         if self.description:
             return f"{self.verb} '{self.description}' "
@@ -48,6 +74,8 @@ class MissionStep:
             return f"{self.verb}"
 
 class Propagate(MissionStep):
+    __slots__ = ("prop", "sats", "termination")
+
     def __init__(self, prop: Propagator, sats: list[Spacecraft], termination: list[tuple[str, float | None]], description = "") -> None:
         super().__init__("Propagate", description)
         self.prop = prop
@@ -80,7 +108,12 @@ class Propagate(MissionStep):
 
         return f"{self.preamble()} {self.prop.name}{sat_list} {{{term_list}}}"
 
+    def resources(self) -> list[Resource]:
+        return [*self.sats, self.prop]
+
 class Maneuver(MissionStep):
+    __slots__ = ("burn", "spacecraft")
+
     def __init__(self,  burn: ImpulseiveBurn, spacecraft: Spacecraft, description = ""):
         super().__init__(description)
         self.burn = burn
@@ -88,9 +121,14 @@ class Maneuver(MissionStep):
 
     def to_gmat_script(self):
         return f"Maneuver {self.burn.name}({self.spacecraft.name})"
+
+    def resources(self) -> list[Resource]:
+        return [self.spacecraft, self.burn]
         
 class Report(MissionStep):
     """Reports variables"""
+    __slots__ = ("report", "fields")
+
     def __init__(self, report: ReportFile | ReportReader, fields: list[str], description = ""):
         super().__init__("Report", description)
         self.report = report
@@ -100,11 +138,28 @@ class Report(MissionStep):
         fields = " ".join(self.fields)
         return f"{self.preamble()} {self.report.name} {fields};"
 
+    def resources(self) -> list[Resource]:
+        return [self.report]
+
+class Assign(MissionStep):
+    """Sets a parameter, such as `Sat1.INC`, to a value or a GMAT expression"""
+    __slots__ = ("target", "value")
+
+    def __init__(self, target: str, value):
+        super().__init__("GMAT")
+        self.target = target
+        self.value = value
+
+    def to_gmat_script(self):
+        return f"GMAT {self.target} = {self.value};"
+
 class Stop(MissionStep):
     """Stops execution of the mission
     
     This is useful in control logic. It can be used to stop the mission if a certain criteria is met.    
     """
+    __slots__ = ()
+
     def __init__(self):
         super().__init__("Stop")
 
@@ -119,30 +174,53 @@ class MissionBlock:
         self.contents = []
 
 class MissionLogic(MissionStep):
+    __slots__ = ("contents", "close")
+
     def __init__(self, open: str, contents: list[MissionStep] | None, close: str, description = ""):
         super().__init__(open, description)
         self.contents = contents if contents is not None else []
         self.close = close
 
     def to_gmat_script(self) -> str:
-        result = [self.preamble()]
+        return "\n".join(self.iter_gmat_script())
+
+    def iter_gmat_script(self) -> Iterator[str]:
+        # Stream nested steps rather than joining each level of nesting
+        yield self.preamble()
         for obj in self.contents:
-            result.append(obj.to_gmat_script())
-        result.append(self.close)
-        return "\n".join(result)
+            yield from obj.iter_gmat_script()
+        yield self.close
     
     def append(self, contents: MissionStep):
         self.contents.append(contents)
 
 class ForLoop(MissionLogic):
+    __slots__ = ("variable", "start", "step", "end")
+
     def __init__(self, variable: Variable, start: int, step: int, end: int, contents: list[MissionStep] | None = None):
         super().__init__(f"For {variable.name} = {start}:{step}:{end};", contents, "EndFor;")
+        self.variable = variable
+        self.start = start
+        self.step = step
+        self.end = end
+
+    def resources(self) -> list[Resource]:
+        return [self.variable]
+
+    def iterations(self) -> int:
+        if self.step == 0:
+            return 0
+        return max(0, int((self.end - self.start) / self.step) + 1)
 
 class WhileLoop(MissionLogic):
+    __slots__ = ()
+
     def __init__(self, condition: Condition, contents: list[MissionStep] | None = None):
         super().__init__(f"While {condition.serialize()}", contents, "EndWhile;")
     
 class IfBlock(MissionLogic):
+    __slots__ = ()
+
     def __init__(self, condition: Condition, contents: list[MissionStep] | None = None):
         super().__init__(f"If {condition.serialize()}", contents, "EndIf;")
 
@@ -156,12 +234,21 @@ class ExitMode(Enum):
     Stop = 3
 
 class TargetBlock(MissionLogic):
+    __slots__ = ("solver", "solvemode")
+
     def __init__(self, solver: DifferentialCorrector, contents: list[MissionStep] | None = None, solvemode: SolverMode = SolverMode.Solve, exitmode: ExitMode = ExitMode.DiscardAndContinue, description = ""):
         open = f"Target {solver.name} {{SolveMode = {solvemode.name}, ExitMode = {exitmode.name}, ShowProgressWindow = false}};"
         super().__init__(open, contents, "EndTarget;", description)
+        self.solver = solver
+        self.solvemode = solvemode
+
+    def resources(self) -> list[Resource]:
+        return [self.solver]
 
 class Vary(MissionStep):
     """Used in a Target block to specify what element to vary"""
+    __slots__ = ("solver", "variable", "initial", "perturbation", "lower", "upper", "maxstep", "additivescale", "multiplescale")
+
     def __init__(self, solver: DifferentialCorrector, variable: str, initial = 0.5, perturbation = 0.0001, lower = -100, upper = 100, maxstep = 0.2, additivescale = 0.0, multiplescale = 1.0, description = ""):
         super().__init__(description)
         self.solver = solver
@@ -174,11 +261,16 @@ class Vary(MissionStep):
         self.additivescale = additivescale
         self.multiplescale = multiplescale
 
+    def resources(self) -> list[Resource]:
+        return [self.solver]
+
     def to_gmat_script(self):
         return f"Vary {self.solver.name}({self.variable} = {self.initial}, {{Perturbation = {self.perturbation}, Lower = {self.lower}, Upper = {self.upper}, AdditiveScaleFactor = {self.additivescale}, MultiplicativeScaleFactor = {self.multiplescale}}});"
 
 class Achieve(MissionStep):
     """Used in a Target block to specify termination conditions"""
+    __slots__ = ("solver", "goal", "value", "tolerance")
+
     def __init__(self, solver: DifferentialCorrector, goal: str, value, tolerance = 0.1, description: str = ""):
         super().__init__(description)
         self.solver = solver
@@ -186,6 +278,9 @@ class Achieve(MissionStep):
         self.value = value
         self.tolerance = tolerance
 
+    def resources(self) -> list[Resource]:
+        return [self.solver]
+
     def to_gmat_script(self):
         condition = Condition(self.goal, Comparison.EQUAL, self.value)
         return f"Achieve {self.solver.name}({condition.serialize()}, {{Tolerance = {self.tolerance}}});"
@@ -0,0 +1,212 @@
+import os
+import re
+import tempfile
+from typing import Iterator
+from .script import Script
+from .mission import Propagate
+from .resources.resource import Resource
+from .resources.coordsys import CoordinateSystem
+from .resources.prop import ForceModel, Propagator
+from .resources.solvers import DifferentialCorrector
+from .resources.report import ReportFile, ReportReader
+from .dispatch import MissionResult, RunStatus, parallel_process
+
+# Resources that hold no state during a run, so members defining them identically can share one copy
+_SHARED = (CoordinateSystem, ForceModel, Propagator, DifferentialCorrector)
+
+class _Renamer:
+    """
+    Renames whole identifiers in GMAT text, leaving quoted strings such as file paths alone
+
+    The field being assigned, such as `FM` in `GMAT Prop.FM = FM;`, is left alone too, even when a resource shares its name.
+    """
+    def __init__(self, names: dict[str, str]):
+        self.names = names
+        self.pattern = None
+        if names:
+            alternatives = "|".join(re.escape(name) for name in sorted(names, key=len, reverse=True))
+            self.pattern = re.compile(rf"'[^']*'|\.\w+(?=\s*=)|(?<!\w)({alternatives})(?!\w)")
+
+    def _replace(self, match: re.Match) -> str:
+        return self.names[match.group(1)] if match.group(1) else match.group(0)
+
+    def __call__(self, text: str) -> str:
+        if self.pattern is None:
+            return text
+        return self.pattern.sub(self._replace, text)
+
+class PackedScript(Script):
+    """
+    Several independent scripts run as one, paying GMAT startup once
+
+    Resources that clash by name are renamed with the index of their member (`Sat1` becomes `Sat1_3`),
+    except stateless resources such as propagators that members define identically, which are shared.
+    Members run one after another, each with only its own reports switched on.
+    With `together`, members that are each a single `Propagate` are instead propagated in one step,
+    which lets the integrator pick a step size for all of them, so results differ slightly from separate runs.
+
+    Call `unpack()` once the script has run to restore the original names in the report headers.
+    """
+    def __init__(self, members: list[Script], together: bool = False):
+        super().__init__([], [])
+        if not members:
+            raise ValueError("Must have at least one script to pack")
+        self.members = members
+        self.together = together
+
+        taken: dict[str, str] = {}
+        self.renames: list[dict[str, str]] = []
+        self._resources: list[tuple[Resource, int]] = []
+        for index, member in enumerate(members):
+            renames = {}
+            # Dependencies come first, so a resource is compared with the renames of everything it refers to applied
+            for resource in member.collect_resources():
+                text = _Renamer(renames)(resource.to_gmat_script())
+                existing = taken.get(resource.name)
+                if existing is None:
+                    taken[resource.name] = text
+                    self._resources.append((resource, index))
+                    continue
+                renamed = any(dependency.name in renames for dependency in resource.dependencies())
+                if isinstance(resource, _SHARED) and not renamed and existing == text:
+                    continue
+                name = f"{resource.name}_{index}"
+                while name in taken:
+                    name += "_"
+                taken[name] = ""
+                renames[resource.name] = name
+                self._resources.append((resource, index))
+            self.renames.append(renames)
+        self._renamers = [_Renamer(renames) for renames in self.renames]
+
+        if together:
+            self._check_together()
+
+    def _check_together(self):
+        first = self.members[0].mission
+        for index, member in enumerate(self.members):
+            steps = member.mission
+            if len(steps) != 1 or not isinstance(steps[0], Propagate):
+                raise ValueError(f"Member {index} is not a single Propagate and cannot be propagated with the others")
+            prop = steps[0].prop
+            renamed = [prop.name, *(dependency.name for dependency in prop.dependencies())]
+            if prop.name != first[0].prop.name or any(name in self.renames[index] for name in renamed):
+                raise ValueError(f"Member {index} uses a different propagator")
+            if self._terms(index) != self._terms(0):
+                raise ValueError(f"Member {index} has different termination conditions")
+            if self._epochs(index) != self._epochs(0):
+                raise ValueError(f"Member {index} starts at a different epoch")
+
+    def _terms(self, index: int) -> list[tuple[str, float | None]]:
+        # Termination conditions with the member's own spacecraft names masked out
+        step: Propagate = self.members[index].mission[0]
+        mask = _Renamer({sat.name: "\x00" for sat in step.sats})
+        return [(mask(parameter), value) for parameter, value in step.termination]
+
+    def _epochs(self, index: int) -> set[str]:
+        return {sat.epoch.to_gmat("") for sat in self.members[index].mission[0].sats}
+
+    def reports(self) -> list[ReportFile | ReportReader]:
+        return [report for member in self.members for report in member.reports()]
+
+    def _report_paths(self) -> list[str]:
+        return [path for member in self.members for path in member.outputs()]
+
+    def _member_reports(self, index: int) -> list[str]:
+        rename = self._renamers[index]
+        return [rename(report.name) for report in self.members[index].reports()]
+
+    def _member_pieces(self, index: int, pieces: Iterator[str]) -> Iterator[str]:
+        rename = self._renamers[index]
+        redirects = self.members[index].redirects
+        for piece in pieces:
+            piece = rename(piece)
+            for path, redirect in redirects.items():
+                if path in piece:
+                    piece = piece.replace(f"'{path}'", f"'{redirect}'")
+            yield piece
+
+    def _lines(self) -> Iterator[str]:
+        for resource, index in self._resources:
+            yield from self._member_pieces(index, resource.iter_gmat_script())
+            yield ""
+
+        yield "BeginMissionSequence;"
+        if self.together:
+            step: Propagate = self.members[0].mission[0]
+            sats = ", ".join(self._renamers[index](sat.name) for index, member in enumerate(self.members) for sat in member.mission[0].sats)
+            terms = ", ".join(parameter if value is None else f"{parameter} = {value}" for parameter, value in step.termination)
+            yield ""
+            yield f"{step.preamble()} {step.prop.name}({sats}) {{{self._renamers[0](terms)}}}"
+            return
+
+        reports = [name for index in range(len(self.members)) for name in self._member_reports(index)]
+        if reports:
+            yield ""
+            yield "\n".join(f"Toggle {name} Off;" for name in reports)
+        for index, member in enumerate(self.members):
+            reports = self._member_reports(index)
+            if reports:
+                yield ""
+                yield "\n".join(f"Toggle {name} On;" for name in reports)
+            for step in member.mission:
+                yield ""
+                yield from self._member_pieces(index, step.iter_gmat_script())
+            if reports:
+                yield ""
+                yield "\n".join(f"Toggle {name} Off;" for name in reports)
+
+    def _restorer(self, index: int) -> _Renamer:
+        return _Renamer({name: original for original, name in self.renames[index].items()})
+
+    def unpack_data(self, index: int, data: dict[str, dict]) -> dict[str, dict]:
+        """The parsed reports of one member (see `MissionResult.data`), with its original names restored"""
+        restore = self._restorer(index)
+        reports = [report.name for report in self.members[index].reports() if isinstance(report, ReportReader)]
+        return {name: {restore(field): values for field, values in data[name].items()} for name in reports if name in data}
+
+    def unpack(self):
+        """Restores the original names in the headers of the reports written by each member"""
+        for index, member in enumerate(self.members):
+            restore = self._restorer(index)
+            for report, path in zip(member.reports(), member.outputs()):
+                if isinstance(report, ReportFile) and not report.headers:
+                    continue
+                _rewrite_header(path, restore)
+
+def _rewrite_header(path: str, rename: _Renamer):
+    with open(path, "r", encoding="ascii") as file:
+        header = file.readline()
+        renamed = rename(header)
+        if renamed == header:
+            return
+        handle, temp = tempfile.mkstemp(dir=os.path.dirname(path) or None)
+        with os.fdopen(handle, "w", encoding="ascii") as out:
+            out.write(renamed)
+            for line in file:
+                out.write(line)
+    os.replace(temp, path)
+
+def pack(missions: list[Script], size: int, together: bool = False) -> list[PackedScript]:
+    """Packs consecutive missions into scripts of up to `size` members"""
+    if size < 1:
+        raise ValueError("Pack size must be greater than zero")
+    return [PackedScript(missions[start:start + size], together) for start in range(0, len(missions), size)]
+
+def packed_process(missions: list[Script], size: int, together: bool = False, **kwargs) -> list[MissionResult]:
+    """
+    Runs a set of missions in packs of up to `size` members with `parallel_process`
+
+    Keyword arguments are passed on to `parallel_process`.
+    Returns the result of each mission in the order of `missions`; every member of a pack shares its status.
+    """
+    packs = pack(missions, size, together)
+    results = []
+    for result in parallel_process(packs, **kwargs):
+        packed = packs[result.index]
+        if result.status != RunStatus.FAILED and result.status != RunStatus.TIMEOUT:
+            packed.unpack()
+        for offset, member in enumerate(packed.members):
+            data = packed.unpack_data(offset, result.data) if result.data is not None else None
+            results.append(MissionResult(result.index * size + offset, member, result.status, result.error, data))
+    return results
@@ -2,6 +2,7 @@ from enum import Enum
 from .resource import Resource
 from .coordsys import CoordinateSystem
 from .celestial import CelestialBody
+from .param import Param
 
 class LocalCoordinateSystemAxes(Enum):
     VNB = 1,
@@ -15,12 +16,14 @@ class LocalCoordinateSystem:
         self.axes = axes
 
 class ImpulseiveBurn(Resource):
+    __slots__ = ("coordsys", "vector")
+
     def __init__(self, name, coordsys: CoordinateSystem | LocalCoordinateSystem, vector: list = [0.0, 0.0, 0.0]):
         super().__init__(name)
         self.coordsys = coordsys
         if len(vector) != 3:
             raise ValueError("Expecting Delta-V Vector length of 3")
-        if not all(isinstance(x, (int, float)) for x in vector):
+        if not all(isinstance(x, (int, float, Param)) for x in vector):
             raise ValueError("Expecting numbers in Delta-V Vector")
         self.vector = vector
     
@@ -44,6 +47,11 @@ class ImpulseiveBurn(Resource):
                     f"GMAT {self.name}.Element3 = {self.vector[2]};\n"
                 )
 
+    def dependencies(self) -> list[Resource]:
+        if isinstance(self.coordsys, CoordinateSystem):
+            return [self.coordsys]
+        return []
+
     def element1(self) -> str:
         return f"{self.name}.Element1"
     
@@ -1,7 +1,8 @@
 class CelestialBody:
-    def __init__(self, name: str, radius: float):
+    def __init__(self, name: str, radius: float, mu: float | None = None):
         self.name = name
         self.radius = radius
+        self.mu = mu  # Gravitational parameter (km^3/s^2), needed for element conversions
     
     def radius_of_altitude(self, altitude: float) -> float:
         return self.radius + altitude
@@ -9,15 +10,15 @@ class CelestialBody:
     def altitude_of_radius(self, radius: float) -> float:
         return radius - self.radius
 
-# Constants for each celestial body
-SUN = CelestialBody("Sun", 696340)
-MERCURY = CelestialBody("Mercury", 2439.7)
-VENUS = CelestialBody("Venus", 6051.8)
-EARTH = CelestialBody("Earth", 6371.0)
-MARS = CelestialBody("Mars", 3389.5)
-JUPITER = CelestialBody("Jupiter", 69911)
-SATURN = CelestialBody("Saturn", 58232)
-URANUS = CelestialBody("Uranus", 25362)
-NEPTUNE = CelestialBody("Neptune", 24622)
-PLUTO = CelestialBody("Pluto", 1188.3)
-LUNA = CelestialBody("Luna", 1737.5)  # Luna is another name for Earth's Moon
+# Constants for each celestial body, with GMAT's default gravitational parameters
+SUN = CelestialBody("Sun", 696340, 132712440017.99)
+MERCURY = CelestialBody("Mercury", 2439.7, 22032.080486418)
+VENUS = CelestialBody("Venus", 6051.8, 324858.59882646)
+EARTH = CelestialBody("Earth", 6371.0, 398600.4415)
+MARS = CelestialBody("Mars", 3389.5, 42828.314258067)
+JUPITER = CelestialBody("Jupiter", 69911, 126712767.8578)
+SATURN = CelestialBody("Saturn", 58232, 37940626.061137)
+URANUS = CelestialBody("Uranus", 25362, 5794549.0070719)
+NEPTUNE = CelestialBody("Neptune", 24622, 6836534.0638793)
+PLUTO = CelestialBody("Pluto", 1188.3, 981.600887707)
+LUNA = CelestialBody("Luna", 1737.5, 4902.8005821478)  # Luna is another name for Earth's Moon
@@ -11,6 +11,8 @@ class CoordinateSystemAxes(Enum):
 PREDEFINED_COORDINATE_SYSTEMS = ["EarthMJ2000Eq", "EarthMJ2000Ec", "EarthFixed", "EarthICRF"]
 
 class CoordinateSystem(Resource):
+    __slots__ = ("origin", "axes")
+
     def __init__(self, name, origin: CelestialBody, axes: CoordinateSystemAxes | None) -> None:
         super().__init__(name)
         self.origin = origin.name
@@ -18,6 +20,10 @@ class CoordinateSystem(Resource):
             raise ValueError("Axes not defined")
         self.axes = axes
 
+    @property
+    def predefined(self) -> bool:
+        return self.name in PREDEFINED_COORDINATE_SYSTEMS
+
     def to_gmat_script(self) -> str:
         if self.name in PREDEFINED_COORDINATE_SYSTEMS:
             return ""
@@ -28,11 +34,11 @@ class CoordinateSystem(Resource):
                 f"GMAT {self.name}.Axes = {self.axes.name};"
             )
 
-EARTHMJ2000EQ = CoordinateSystem("EarthMJ2000Eq", EARTH, None)
+EARTHMJ2000EQ = CoordinateSystem("EarthMJ2000Eq", EARTH, None).freeze()
 
-EARTHMJ2000EC = CoordinateSystem("EarthMJ2000Ec", EARTH, None)
+EARTHMJ2000EC = CoordinateSystem("EarthMJ2000Ec", EARTH, None).freeze()
 
-EARTHFIXED = CoordinateSystem("EarthFixed", EARTH, None)
+EARTHFIXED = CoordinateSystem("EarthFixed", EARTH, None).freeze()
 
-EARTHICRF = CoordinateSystem("EarthICRF", EARTH, None)
+EARTHICRF = CoordinateSystem("EarthICRF", EARTH, None).freeze()
 """International Celestial Reference Frame"""
\ No newline at end of file
@@ -0,0 +1,109 @@
+import numpy as np
+from .celestial import CelestialBody
+
+# Eccentricities and inclinations (in radians) below this are treated as circular and equatorial, as GMAT does
+KEPLERIAN_TOLERANCE = 1e-11
+
+def _array(value) -> np.ndarray:
+    return np.asarray(value, dtype=np.float64)
+
+def _mu(body: CelestialBody | float | None) -> float:
+    """The gravitational parameter of a body, or the parameter itself"""
+    if not isinstance(body, CelestialBody):
+        if body is None:
+            raise ValueError("Conversion needs the central body or its gravitational parameter")
+        return body
+    if body.mu is None:
+        raise ValueError(f"{body.name} has no gravitational parameter (mu); pass one to CelestialBody to convert elements about it")
+    return body.mu
+
+def keplerian_to_cartesian(sma, ecc, inc, raan, aop, ta, mu: CelestialBody | float) -> tuple[np.ndarray, ...]:
+    """
+    Converts Keplerian elements, with angles in degrees, to Cartesian positions and velocities
+
+    Elements broadcast against each other; `mu` is the central body, such as `EARTH`, or its gravitational parameter.
+    Returns `(x, y, z, vx, vy, vz)`.
+    """
+    mu = _mu(mu)
+    sma, ecc = _array(sma), _array(ecc)
+    inc, raan, aop, ta = (np.radians(_array(angle)) for angle in (inc, raan, aop, ta))
+    p = sma * (1.0 - ecc * ecc)
+    r = p / (1.0 + ecc * np.cos(ta))
+    speed = np.sqrt(mu / p)
+
+    # Rotate the perifocal position and velocity by the argument of latitude, inclination and node
+    u = aop + ta
+    cos_u, sin_u = np.cos(u), np.sin(u)
+    cos_raan, sin_raan = np.cos(raan), np.sin(raan)
+    cos_inc, sin_inc = np.cos(inc), np.sin(inc)
+    along = sin_u + ecc * np.sin(aop)
+    across = cos_u + ecc * np.cos(aop)
+
+    x = r * (cos_raan * cos_u - sin_raan * sin_u * cos_inc)
+    y = r * (sin_raan * cos_u + cos_raan * sin_u * cos_inc)
+    z = r * sin_u * sin_inc
+    vx = -speed * (cos_raan * along + sin_raan * cos_inc * across)
+    vy = -speed * (sin_raan * along - cos_raan * cos_inc * across)
+    vz = speed * sin_inc * across
+    return x, y, z, vx, vy, vz
+
+def _angle(ax, ay, az, bx, by, bz, hx, hy, hz) -> np.ndarray:
+    """The angle from a to b, positive about h, in [0, 2π)"""
+    sine = hx * (ay * bz - az * by) + hy * (az * bx - ax * bz) + hz * (ax * by - ay * bx)
+    return np.arctan2(sine, ax * bx + ay * by + az * bz) % (2.0 * np.pi)
+
+def cartesian_to_keplerian(x, y, z, vx, vy, vz, mu: CelestialBody | float) -> tuple[np.ndarray, ...]:
+    """
+    Converts Cartesian positions and velocities to Keplerian elements, with angles in degrees
+
+    Follows GMAT for the singular cases: an equatorial orbit has a RAAN of 0 and measures from the x axis
+    instead of the node, and a circular orbit has an AOP of 0 and measures the true anomaly from the node.
+    `mu` is the central body or its gravitational parameter. Returns `(sma, ecc, inc, raan, aop, ta)`.
+    """
+    mu = _mu(mu)
+    x, y, z, vx, vy, vz = np.broadcast_arrays(*(_array(value) for value in (x, y, z, vx, vy, vz)))
+    r = np.sqrt(x * x + y * y + z * z)
+    v2 = vx * vx + vy * vy + vz * vz
+    rv = x * vx + y * vy + z * vz
+
+    # Unit angular momentum
+    hx, hy, hz = y * vz - z * vy, z * vx - x * vz, x * vy - y * vx
+    h = np.sqrt(hx * hx + hy * hy + hz * hz)
+    hx, hy, hz = hx / h, hy / h, hz / h
+
+    # Eccentricity vector
+    radial = (v2 - mu / r) / mu
+    tangential = rv / mu
+    ex, ey, ez = radial * x - tangential * vx, radial * y - tangential * vy, radial * z - tangential * vz
+    ecc = np.sqrt(ex * ex + ey * ey + ez * ez)
+
+    sma = 1.0 / (2.0 / r - v2 / mu)
+    inc = np.arccos(np.clip(hz, -1.0, 1.0))
+
+    # The node, or the x axis for equatorial orbits
+    node = np.hypot(hx, hy)
+    equatorial = node < KEPLERIAN_TOLERANCE
+    safe = np.where(equatorial, 1.0, node)
+    nx = np.where(equatorial, 1.0, -hy / safe)
+    ny = np.where(equatorial, 0.0, hx / safe)
+    nz = np.zeros_like(nx)
+    raan = np.where(equatorial, 0.0, np.arctan2(ny, nx) % (2.0 * np.pi))
+
+    # Periapsis, or the node for circular orbits
+    circular = ecc < KEPLERIAN_TOLERANCE
+    px = np.where(circular, nx, ex)
+    py = np.where(circular, ny, ey)
+    pz = np.where(circular, nz, ez)
+    aop = _angle(nx, ny, nz, px, py, pz, hx, hy, hz)
+    ta = _angle(px, py, pz, x, y, z, hx, hy, hz)
+    return sma, ecc, np.degrees(inc), np.degrees(raan), np.degrees(aop), np.degrees(ta)
+
+def keplerian_to_radii(sma, ecc) -> tuple[np.ndarray, np.ndarray]:
+    """The periapsis and apoapsis radii of orbits; the apoapsis radius of a hyperbola is negative, as in GMAT"""
+    sma, ecc = _array(sma), _array(ecc)
+    return sma * (1.0 - ecc), sma * (1.0 + ecc)
+
+def radii_to_keplerian(radper, radapo) -> tuple[np.ndarray, np.ndarray]:
+    """The semi-major axis and eccentricity of orbits with the given periapsis and apoapsis radii"""
+    radper, radapo = _array(radper), _array(radapo)
+    return (radper + radapo) / 2.0, (radapo - radper) / (radapo + radper)
@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
 from enum import Enum
+from .resource import Freezable
 
 class TimeStandard(Enum):
     TAI = 1
@@ -14,7 +15,9 @@ class TimeStandard(Enum):
     TT = 4
     """Terrestrial Time"""
 
-class Epoch(ABC):
+class Epoch(Freezable, ABC):
+    __slots__ = ("standard",)
+
     def __init__(self, standard: TimeStandard):
         self.standard = standard
         super().__init__()
@@ -23,17 +26,83 @@ class Epoch(ABC):
     def to_gmat(self, name: str) -> str:
         pass
 
+    @abstractmethod
+    def assignment(self, name: str) -> tuple[str, str]:
+        """The epoch parameter of a spacecraft and the value that sets it in the mission sequence"""
+        pass
+
+    @abstractmethod
+    def to_modjulian(self, standard: TimeStandard | None = None) -> "ModJulianEpoch":
+        """The same instant as a ModJulian epoch, in `standard` (this epoch's own by default). Converting between standards requires numpy."""
+        pass
+
+# GMAT's ModJulian days count from JD 2430000.0
+MODJULIAN_OFFSET = 2430000.0
+
+# The GMAT ModJulian date of 1970-01-01 00:00
+_UNIX_MODJULIAN = 2440587.5 - MODJULIAN_OFFSET
+
+MONTHS = ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+_MONTH_NUMBERS = {month: i + 1 for i, month in enumerate(MONTHS)}
+
+def _days_from_civil(year, month, day):
+    """Days since 1970-01-01 of a proleptic Gregorian date, for ints or integer arrays alike"""
+    year = year - (month <= 2)
+    era = year // 400
+    yoe = year - era * 400
+    doy = (153 * ((month + 9) % 12) + 2) // 5 + day - 1
+    doe = yoe * 365 + yoe // 4 - yoe // 100 + doy
+    return era * 146097 + doe - 719468
+
+def _civil_from_days(days):
+    """The year, month and day of a count of days since 1970-01-01, for ints or integer arrays alike"""
+    days = days + 719468
+    era = days // 146097
+    doe = days - era * 146097
+    yoe = (doe - doe // 1460 + doe // 36524 - doe // 146096) // 365
+    doy = doe - (365 * yoe + yoe // 4 - yoe // 100)
+    mp = (5 * doy + 2) // 153
+    day = doy - (153 * mp + 2) // 5 + 1
+    month = mp + 3 - 12 * (mp >= 10)
+    return yoe + era * 400 + (month <= 2), month, day
+
+def gregorian_modjulian(day: str, month: str, year: str, clock: str) -> float:
+    """
+    The ModJulian date of a Gregorian epoch as GMAT writes it, split on whitespace
+
+    For example `gregorian_modjulian("01", "Jan", "2000", "12:00:00.000")` is 21545.0.
+    """
+    number = _MONTH_NUMBERS.get(month)
+    if number is None:
+        raise ValueError(f"could not convert string to epoch: '{day} {month} {year} {clock}'")
+    hour, minute, second = clock.split(":")
+    days = _days_from_civil(int(year), number, int(day))
+    return days + _UNIX_MODJULIAN + (int(hour) * 3600 + int(minute) * 60 + float(second)) / 86400.0
+
 class ModJulianEpoch(Epoch):
+    __slots__ = ("time",)
+
     def __init__(self, standard: TimeStandard, time: float):
         super().__init__(standard)
         self.time = time
 
     def to_gmat(self, name: str) -> str:
         return f"GMAT {name}.DateFormat = {self.standard.name}ModJulian;\nGMAT {name}.Epoch = {self.time};\n"
+
+    def assignment(self, name: str) -> tuple[str, str]:
+        return f"{name}.{self.standard.name}ModJulian", f"{self.time}"
+
+    def to_modjulian(self, standard: TimeStandard | None = None) -> "ModJulianEpoch":
+        if standard is None or standard == self.standard:
+            return ModJulianEpoch(self.standard, self.time)
+        from .timesystems import convert_modjulian
+        return ModJulianEpoch(standard, float(convert_modjulian(self.time, self.standard, standard)))
     
 from datetime import datetime
 
 class GregorianEpoch(Epoch):
+    __slots__ = ("day", "month", "year", "hour", "minute", "second", "millisecond")
+
     def __init__(self, standard: TimeStandard, day: int, month: int, year: int,
                  hour: int = 0, minute: int = 0, second: int = 0, millisecond: int = 0):
         super().__init__(standard)
@@ -73,3 +142,11 @@ class GregorianEpoch(Epoch):
 
     def to_gmat(self, name: str) -> str:
         return f"GMAT {name}.DateFormat = {self.standard.name}Gregorian;\nGMAT {name}.Epoch = '{self.to_string()}';\n"
+
+    def assignment(self, name: str) -> tuple[str, str]:
+        return f"{name}.{self.standard.name}Gregorian", f"'{self.to_string()}'"
+
+    def to_modjulian(self, standard: TimeStandard | None = None) -> ModJulianEpoch:
+        days = _days_from_civil(self.year, self.month, self.day)
+        seconds = self.hour * 3600 + self.minute * 60 + self.second + self.millisecond / 1000.0
+        return ModJulianEpoch(self.standard, days + _UNIX_MODJULIAN + seconds / 86400.0).to_modjulian(standard)
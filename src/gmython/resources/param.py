@@ -0,0 +1,42 @@
+import re
+
+MARKER = "\x00"
+"""Delimits parameter slots in serialized text"""
+
+SLOT = re.compile(MARKER + r"(\w+)" + MARKER)
+
+class Param:
+    """
+    A named placeholder for a value that is filled in when a `ScriptTemplate` is rendered
+
+    Params can be used wherever a resource or mission step takes a number (or a report path).
+    """
+    def __init__(self, name: str):
+        if not name.isidentifier():
+            raise ValueError(f"Parameter name must be an identifier, got {name!r}")
+        self.name = name
+
+    def __str__(self) -> str:
+        return f"{MARKER}{self.name}{MARKER}"
+
+    def __format__(self, spec: str) -> str:
+        return str(self)
+
+    def __repr__(self) -> str:
+        return f"Param({self.name!r})"
+
+class Slots:
+    """Text split around its parameter slots, so that it can be rendered with a single join"""
+    def __init__(self, text: str):
+        parts = SLOT.split(text)
+        self.literals = parts[0::2]
+        self.slots = parts[1::2]
+        self.params = list(dict.fromkeys(self.slots))
+
+    def render(self, values: dict) -> str:
+        if not self.slots:
+            return self.literals[0]
+        parts = [""] * (2 * len(self.slots) + 1)
+        parts[0::2] = self.literals
+        parts[1::2] = [format(values[slot]) for slot in self.slots]
+        return "".join(parts)
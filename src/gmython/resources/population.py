@@ -0,0 +1,150 @@
+from enum import Enum
+from typing import Iterator
+import numpy as np
+from .resource import Resource
+from .coordsys import CoordinateSystem, EARTHMJ2000EQ
+from .celestial import CelestialBody
+from .epoch import Epoch, TimeStandard, ModJulianEpoch
+from .spacecraft import State, CartesianState, KeplerianState, ModifiedKeplerianState
+from .elements import keplerian_to_cartesian, cartesian_to_keplerian, keplerian_to_radii, radii_to_keplerian
+
+class StateLayout(Enum):
+    CARTESIAN = 1
+    KEPLERIAN = 2
+    MODIFIED_KEPLERIAN = 3
+
+    def state_type(self) -> type[State]:
+        return _STATE_TYPES[self]
+
+    def template(self) -> str:
+        """The GMAT lines of one state, with the spacecraft name as `{0}` and the elements as `{1}` to `{6}`"""
+        display, fields = _FIELDS[self]
+        lines = [f"GMAT {{0}}.DisplayStateType = {display};"]
+        lines.extend(f"GMAT {{0}}.{field} = {{{index + 1}}};" for index, field in fields)
+        return "\n".join(lines)
+
+_STATE_TYPES = {
+    StateLayout.CARTESIAN: CartesianState,
+    StateLayout.KEPLERIAN: KeplerianState,
+    StateLayout.MODIFIED_KEPLERIAN: ModifiedKeplerianState,
+}
+
+# GMAT fields in the order the state classes write them, each with its position in the batch
+_FIELDS = {
+    StateLayout.CARTESIAN: ("Cartesian", list(enumerate(["X", "Y", "Z", "VX", "VY", "VZ"]))),
+    StateLayout.KEPLERIAN: ("Keplerian", list(enumerate(["SMA", "ECC", "INC", "RAAN", "AOP", "TA"]))),
+    StateLayout.MODIFIED_KEPLERIAN: ("Keplerian", [(1, "RadApo"), (0, "RadPer"), (2, "INC"), (3, "RAAN"), (4, "AOP"), (5, "TA")]),
+}
+
+class StateBatch:
+    """
+    The states of many spacecraft, held as one contiguous array per element
+
+    Elements are given in the argument order of the matching state class and broadcast against each other,
+    so `StateBatch.keplerian(7000.0, 0.0, np.linspace(0, 90, 91), 0.0, 0.0, 0.0)` holds 91 states.
+    """
+    __slots__ = ("layout", "values")
+
+    def __init__(self, layout: StateLayout, elements):
+        if len(elements) != 6:
+            raise ValueError(f"Expecting 6 elements, got {len(elements)}")
+        arrays = np.broadcast_arrays(*[np.asarray(element, dtype=float) for element in elements])
+        if arrays[0].ndim != 1:
+            raise ValueError("Elements must be scalars or one-dimensional arrays")
+        self.layout = layout
+        self.values = np.stack(arrays)
+        self.validate()
+
+    @staticmethod
+    def cartesian(x, y, z, vx, vy, vz) -> "StateBatch":
+        return StateBatch(StateLayout.CARTESIAN, (x, y, z, vx, vy, vz))
+
+    @staticmethod
+    def keplerian(sma, ecc, inc, raan, aop, ta) -> "StateBatch":
+        return StateBatch(StateLayout.KEPLERIAN, (sma, ecc, inc, raan, aop, ta))
+
+    @staticmethod
+    def modified_keplerian(radper, radapo, inc, raan, aop, ta) -> "StateBatch":
+        return StateBatch(StateLayout.MODIFIED_KEPLERIAN, (radper, radapo, inc, raan, aop, ta))
+
+    def validate(self):
+        """Checks every state at once, naming the offending members"""
+        def members(invalid: np.ndarray) -> str:
+            indices = np.flatnonzero(invalid)
+            listed = ", ".join(str(i) for i in indices[:10])
+            return listed + (f" and {len(indices) - 10} more" if len(indices) > 10 else "")
+
+        invalid = ~np.isfinite(self.values).all(axis=0)
+        if invalid.any():
+            raise ValueError(f"Non-finite state elements in members {members(invalid)}")
+        if self.layout == StateLayout.MODIFIED_KEPLERIAN:
+            invalid = self.values[1] < self.values[0]
+            if invalid.any():
+                raise ValueError(f"Apoapsis radius must be larger than periapsis radius in members {members(invalid)}")
+
+    def convert(self, layout: StateLayout, mu: CelestialBody | float) -> "StateBatch":
+        """The same states in another layout, converted in bulk about `mu`, a body or its gravitational parameter"""
+        if layout == self.layout:
+            return self
+        values = self.values
+        if self.layout == StateLayout.MODIFIED_KEPLERIAN:
+            values = np.stack([*radii_to_keplerian(values[0], values[1]), *values[2:]])
+        if self.layout != StateLayout.CARTESIAN:
+            values = np.stack(keplerian_to_cartesian(*values, mu))
+        if layout != StateLayout.CARTESIAN:
+            values = np.stack(cartesian_to_keplerian(*values, mu))
+        if layout == StateLayout.MODIFIED_KEPLERIAN:
+            values = np.stack([*keplerian_to_radii(values[0], values[1]), *values[2:]])
+        return StateBatch(layout, values)
+
+    def __len__(self) -> int:
+        return self.values.shape[1]
+
+    def __getitem__(self, index: int) -> State:
+        return self.layout.state_type()(*self.values[:, index].tolist())
+
+    def iter_gmat_script(self, names: list[str]) -> Iterator[str]:
+        """Yields the state lines of each member, matching what the single state classes write"""
+        if len(names) != len(self):
+            raise ValueError(f"Expecting {len(self)} names, got {len(names)}")
+        template = self.layout.template()
+        for name, row in zip(names, self.values.T.tolist()):
+            yield template.format(name, *row)
+
+class SpacecraftPopulation(Resource):
+    """
+    A spacecraft for each state in a batch, grouped in a GMAT formation named after the population
+
+    Members are named `{name}_{index}`. Propagating the population propagates every member.
+    """
+    __slots__ = ("states", "epoch", "coordinate_system")
+
+    def __init__(self, name: str, states: StateBatch, epoch: Epoch = ModJulianEpoch(TimeStandard.TAI, 21545.0), coord_system: CoordinateSystem = EARTHMJ2000EQ):
+        super().__init__(name)
+        self.states = states
+        self.epoch = epoch
+        self.coordinate_system = coord_system
+
+    def __len__(self) -> int:
+        return len(self.states)
+
+    def names(self) -> list[str]:
+        return [f"{self.name}_{i}" for i in range(len(self.states))]
+
+    def dependencies(self) -> list[Resource]:
+        return [self.coordinate_system]
+
+    def to_gmat_script(self) -> str:
+        return "\n".join(self.iter_gmat_script())
+
+    def iter_gmat_script(self) -> Iterator[str]:
+        names = self.names()
+        header = (
+            "Create Spacecraft {0};\n"
+            f"{self.epoch.to_gmat('{0}')}"
+            f"GMAT {{0}}.CoordinateSystem = {self.coordinate_system.name};\n"
+        )
+        for name, state in zip(names, self.states.iter_gmat_script(names)):
+            yield header.format(name) + state
+            yield ""
+        yield f"Create Formation {self.name};\nGMAT {self.name}.Add = {{{', '.join(names)}}};"
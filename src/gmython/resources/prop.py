@@ -1,8 +1,10 @@
 from enum import Enum
-from .resource import Resource
+from .resource import Resource, Freezable
 from .celestial import CelestialBody
 
-class GravityField:
+class GravityField(Freezable):
+    __slots__ = ("name", "degree", "order", "potential_file", "stm_limit")
+
     def __init__(self, name: str, degree: int, order: int, file: str):
         self.name = name
         self.degree = degree
@@ -36,6 +38,8 @@ class ErrorControl(Enum):
     LargetsState = 4
 
 class ForceModel(Resource):
+    __slots__ = ("gravity_field", "body", "point_masses", "error_control")
+
     def __init__(self, name: str, gravity: GravityField, body: CelestialBody, point_masses: list[CelestialBody] = None):
         super().__init__(name)
         self.gravity_field = gravity
@@ -62,12 +66,15 @@ class ForceModel(Resource):
         return script
 
 class Propagator(Resource):
+    __slots__ = ("force_model", "force_model_name", "method", "initial_step_size", "accuracy", "min_step", "max_step", "max_attempts", "stop_if_violated")
+
     def __init__(
         self,
         name: str,
         force_model: ForceModel,
     ):
         super().__init__(name)
+        self.force_model = force_model
         self.force_model_name = force_model.name
         self.method = "RungeKutta89"
         self.initial_step_size = 60.0
@@ -89,3 +96,6 @@ class Propagator(Resource):
             f"GMAT {self.name}.MaxStepAttempts = {self.max_attempts};\n"
             f"GMAT {self.name}.StopIfAccuracyIsViolated = {'true' if self.stop_if_violated else 'false'};"
         )
+
+    def dependencies(self) -> list[Resource]:
+        return [self.force_model]
@@ -1,9 +1,14 @@
+import json
+import shutil
 import tempfile
 import os
+import time
 from contextlib import contextmanager
+from typing import Callable, Iterator
 from pathlib import Path
 from .resource import Resource
 from .coordsys import CoordinateSystem
+from .epoch import gregorian_modjulian
 
 def cartesian_headers(obj: Resource, frame: CoordinateSystem) -> list[str]:
     return [
@@ -41,6 +46,8 @@ def angular_momentum_headers(obj: Resource, frame: CoordinateSystem) -> list[str
         ]
 
 class ReportFile(Resource):
+    __slots__ = ("outfile", "fields", "headers", "delimiter")
+
     def __init__(self, name, outfile: str, fields: list[str] = None, headers: bool = True, delimiter: str = " "):
         super().__init__(name)
         self.outfile = outfile
@@ -72,14 +79,39 @@ class ReportFile(Resource):
         return "\n".join(lines)
 
 @contextmanager
-def temp_report_file(fields: list[str] = None, headers: bool = True, delimiter: str = " "):
-    with tempfile.NamedTemporaryFile(delete=False) as outfile:
+def temp_report_file(fields: list[str] = None, headers: bool = True, delimiter: str = " ", dir: str | None = None):
+    with tempfile.NamedTemporaryFile(dir=dir, delete=False) as outfile:
         outfile.close()
         name = Path(outfile.name).stem
         try:
             yield ReportFile(name, outfile.name, fields, headers, delimiter)
         finally:
-            pass
+            if os.path.exists(outfile.name):
+                os.remove(outfile.name)
+
+def _spans(fields: list[str]) -> list[int]:
+    """The number of whitespace separated values of each field; a Gregorian epoch such as `01 Jan 2000 11:59:28.000` has four"""
+    return [4 if field.endswith("Gregorian") else 1 for field in fields]
+
+def _convert(values: list[str], start: int, span: int) -> float:
+    return float(values[start]) if span == 1 else gregorian_modjulian(*values[start:start + span])
+
+def _row_parser(fields: list[str]) -> Callable[[list[str]], list[float]]:
+    """Converts the values of a row, decoding Gregorian epochs into ModJulian dates in their own time standard"""
+    spans = _spans(fields)
+    width = sum(spans)
+    starts = [sum(spans[:i]) for i in range(len(spans))]
+
+    def parse(values: list[str]) -> list[float]:
+        if len(values) != width:
+            raise ValueError(f"Row length mismatch: {values}")
+        try:
+            if width == len(fields):
+                return [float(value) for value in values]
+            return [_convert(values, start, span) for start, span in zip(starts, spans)]
+        except ValueError as e:
+            raise ValueError(f"Non-float value encountered: {e}")
+    return parse
 
 def parse_report(path: str) -> list[dict[str, float]]:
     data = []
@@ -89,18 +121,283 @@ def parse_report(path: str) -> list[dict[str, float]]:
             return data
 
         fields = lines[0].strip().split()
+        parse = _row_parser(fields)
         for line in lines[1:]:
-            values = line.strip().split()
-            if len(values) != len(fields):
+            data.append(dict(zip(fields, parse(line.strip().split()))))
+    return data
+
+def follow_report(path: str, running: Callable[[], bool], interval: float = 0.1) -> Iterator[dict[str, float]]:
+    """
+    Yields the rows of a report as they are written, like `tail -f`
+
+    Only complete lines are parsed. Once `running()` returns False, the rest of the file is read and the generator ends.
+    Raises the same errors as `parse_report`.
+    """
+    def parse(line: str) -> dict[str, float]:
+        return dict(zip(fields, convert(line.split())))
+
+    fields = None
+    pending = ""
+    with open(path, 'r', encoding='ascii') as file:
+        while True:
+            # Check before reading so that anything written before the writer stopped is read
+            alive = running()
+            data = file.read()
+            if not data:
+                if not alive:
+                    break
+                time.sleep(interval)
+                continue
+
+            *lines, pending = (pending + data).split("\n")
+            for line in lines:
+                if fields is None:
+                    fields = line.split()
+                    convert = _row_parser(fields)
+                else:
+                    yield parse(line)
+
+    if pending:
+        if fields is None:
+            return
+        yield parse(pending)
+
+def iter_report_chunks(path: str, fields: list[str] | None = None, where = None, rows: int = 65536) -> Iterator[dict[str, list[float]]]:
+    """
+    Reads a report in chunks of up to `rows` rows, each a list of values per field
+
+    Only the columns in `fields` (every column by default) are converted, and rows that do not meet
+    `where`, a `Condition` on one of the columns, are skipped before anything else is converted.
+    Memory is bounded by the chunk size rather than the size of the report.
+    Raises the same errors as `parse_report`, except that non-float values are only caught in converted columns.
+    """
+    if rows < 1:
+        raise ValueError("Chunk size must be greater than zero")
+
+    with open(path, 'r', encoding='ascii') as file:
+        header = file.readline().split()
+        if not header:
+            return
+
+        # Each field starts at the sum of the spans before it
+        spans = _spans(header)
+        width = sum(spans)
+        index = {}
+        start = 0
+        for field, span in zip(header, spans):
+            index[field] = (start, span)
+            start += span
+        if fields is None:
+            fields = list(index)
+        missing = [field for field in fields if field not in index]
+        if where is not None and where.parameter not in index:
+            missing.append(where.parameter)
+        if missing:
+            raise ValueError(f"Report has no fields: {', '.join(missing)}")
+        columns = [(field, index[field]) for field in fields]
+        filter_column = index[where.parameter] if where is not None else None
+
+        def empty() -> dict[str, list[float]]:
+            return {field: [] for field in fields}
+
+        chunk = empty()
+        count = 0
+        for line in file:
+            values = line.split()
+            if len(values) != width:
                 raise ValueError(f"Row length mismatch: {values}")
             try:
-                row = [float(value) for value in values]
+                if where is not None and not where.evaluate(_convert(values, *filter_column)):
+                    continue
+                for field, column in columns:
+                    chunk[field].append(_convert(values, *column))
             except ValueError as e:
                 raise ValueError(f"Non-float value encountered: {e}")
-            data.append(dict(zip(fields, row)))
-    return data
+            count += 1
+            if count == rows:
+                yield chunk
+                chunk = empty()
+                count = 0
+        if count:
+            yield chunk
+
+def _decode_epoch_columns(text: str, rows: int, spans: list[int]):
+    """The values of a report with Gregorian epoch columns as a (rows, fields) array, or None if they do not all decode"""
+    import numpy as np
+    from .timesystems import gregorian_to_modjulian
+
+    tokens = text.split()
+    width = sum(spans)
+    if len(tokens) != rows * width:
+        return None
+    values = np.empty((rows, len(spans)))
+    start = 0
+    try:
+        for i, span in enumerate(spans):
+            if span == 1:
+                values[:, i] = np.fromiter(map(float, tokens[start::width]), np.float64, rows)
+            else:
+                values[:, i] = gregorian_to_modjulian(*(np.array(tokens[start + piece::width]) for piece in range(span)))
+            start += span
+    except ValueError:
+        return None
+    return values
+
+def parse_report_columns(path: str) -> dict:
+    """
+    Parses a report into a float64 array per column, in one vectorized pass
+
+    Gregorian epoch columns are decoded into ModJulian dates, as by `parse_report`.
+    Raises the same errors as `parse_report` for ragged rows and non-float values. Requires numpy.
+    """
+    import numpy as np
+    import warnings
+
+    with open(path, 'r', encoding='ascii') as file:
+        header = file.readline()
+        if not header:
+            return {}
+        fields = header.strip().split()
+
+        # Count the rows so that blank lines, which numpy skips, are still caught
+        start = file.tell()
+        rows = 0
+        last = "\n"
+        for chunk in iter(lambda: file.read(1 << 20), ""):
+            rows += chunk.count("\n")
+            last = chunk[-1]
+        if last != "\n":
+            rows += 1
+
+        spans = _spans(fields)
+        values = None
+        if rows and len(spans) != sum(spans):
+            file.seek(start)
+            values = _decode_epoch_columns(file.read(), rows, spans)
+        elif rows:
+            file.seek(start)
+            try:
+                with warnings.catch_warnings():
+                    warnings.simplefilter("ignore")
+                    values = np.loadtxt(file, dtype=np.float64, comments=None, ndmin=2)
+            except ValueError:
+                values = None
+            if values is not None and values.shape != (rows, len(fields)):
+                values = None
+        else:
+            values = np.empty((0, len(fields)))
+
+    if values is None:
+        # Let the row-by-row parser raise its error, or handle values that only float() accepts
+        data = parse_report(path)
+        return {field: np.array([row[field] for row in data], dtype=np.float64) for field in fields}
+
+    columns = np.ascontiguousarray(values.T)
+    return {field: columns[i] for i, field in enumerate(fields)}
+
+SIDECAR_SUFFIX = ".columns"
+
+def _time_field(fields: list[str]) -> str | None:
+    for field in fields:
+        if field.endswith(".ElapsedSecs") or field.endswith(".ElapsedDays"):
+            return field
+    return None
+
+def _sidecar_header(path: str) -> dict | None:
+    """The header of the sidecar of a report, or None if there is none or the report has changed since"""
+    try:
+        with open(os.path.join(path + SIDECAR_SUFFIX, "header.json"), "r", encoding="utf-8") as file:
+            header = json.load(file)
+    except (OSError, ValueError):
+        return None
+    stat = os.stat(path)
+    if header.get("size") != stat.st_size or header.get("mtime") != stat.st_mtime_ns:
+        return None
+    return header
+
+def write_report_sidecar(path: str, epochs: str | None = None) -> dict:
+    """
+    Converts a finished report into a binary sidecar directory next to it, with a `.npy` file per column
+
+    The time column, `epochs` or else the first `ElapsedSecs`/`ElapsedDays` field, is indexed so that
+    windows can be sliced by binary search. Returns the sidecar header. Requires numpy.
+    """
+    import numpy as np
+
+    stat = os.stat(path)
+    columns = parse_report_columns(path)
+    fields = list(columns)
+    epochs = epochs if epochs is not None else _time_field(fields)
+    if epochs is not None and epochs not in columns:
+        raise ValueError(f"Report has no field {epochs}")
+
+    sidecar = path + SIDECAR_SUFFIX
+    staging = tempfile.mkdtemp(prefix=os.path.basename(sidecar) + ".", dir=os.path.dirname(path) or None)
+    try:
+        for i, field in enumerate(fields):
+            np.save(os.path.join(staging, f"{i}.npy"), columns[field])
+
+        # Unsorted times are indexed through the order that sorts them
+        ordered = True
+        if epochs is not None:
+            times = columns[epochs]
+            ordered = bool(np.all(times[1:] >= times[:-1]))
+            if not ordered:
+                np.save(os.path.join(staging, "order.npy"), np.argsort(times, kind="stable"))
+
+        rows = len(columns[fields[0]]) if fields else 0
+        header = {"fields": fields, "rows": rows, "time": epochs, "ordered": ordered, "size": stat.st_size, "mtime": stat.st_mtime_ns}
+        with open(os.path.join(staging, "header.json"), "w", encoding="utf-8") as file:
+            json.dump(header, file)
+
+        shutil.rmtree(sidecar, ignore_errors=True)
+        os.replace(staging, sidecar)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    return header
+
+def load_report_sidecar(path: str, fields: list[str] | None = None, window: tuple[float, float] | None = None) -> dict:
+    """
+    Loads columns of a report from its sidecar as read-only memory maps, writing the sidecar first if needed
+
+    With `window`, only rows whose time lies within `(start, end)`, inclusive, are returned; for a report written
+    in time order these are slices of the memory maps, found without reading the rest of the file.
+    """
+    import numpy as np
+
+    header = _sidecar_header(path)
+    if header is None:
+        header = write_report_sidecar(path)
+    sidecar = path + SIDECAR_SUFFIX
+    index = {field: i for i, field in enumerate(header["fields"])}
+    fields = fields if fields is not None else header["fields"]
+    missing = [field for field in fields if field not in index]
+    if missing:
+        raise ValueError(f"Report has no fields: {', '.join(missing)}")
+
+    def column(field: str):
+        return np.load(os.path.join(sidecar, f"{index[field]}.npy"), mmap_mode="r")
+
+    columns = {field: column(field) for field in fields}
+    if window is None:
+        return columns
+    if header["time"] is None:
+        raise ValueError("Report has no time column to window")
+
+    start, end = window
+    times = column(header["time"])
+    if header["ordered"]:
+        selection = slice(np.searchsorted(times, start, "left"), np.searchsorted(times, end, "right"))
+    else:
+        order = np.load(os.path.join(sidecar, "order.npy"), mmap_mode="r")
+        sorted_times = times[order]
+        selection = np.sort(order[np.searchsorted(sorted_times, start, "left"):np.searchsorted(sorted_times, end, "right")])
+    return {field: values[selection] for field, values in columns.items()}
 
 class ReportReader(Resource):
+    __slots__ = ("fields", "file")
+
     def __init__(self, name: str, file: str, fields: list[str] = None):
         super().__init__(name)
         self.fields = fields if fields is not None else []
@@ -111,13 +408,27 @@ class ReportReader(Resource):
 
     def load(self) -> list[dict[str, float]]:
         return parse_report(self.file)
+
+    def load_columns(self) -> dict:
+        """Loads the report as a float64 array per column"""
+        return parse_report_columns(self.file)
+
+    def iter_chunks(self, fields: list[str] | None = None, where = None, rows: int = 65536) -> Iterator[dict[str, list[float]]]:
+        """Reads the report in bounded chunks, see `iter_report_chunks`"""
+        return iter_report_chunks(self.file, fields, where, rows)
+
+    def load_cached(self, fields: list[str] | None = None, window: tuple[float, float] | None = None) -> dict:
+        """Loads the report from its binary sidecar, see `load_report_sidecar`"""
+        return load_report_sidecar(self.file, fields, window)
     
 @contextmanager
-def build_report_reader(fields: list[str] = None):
-    with tempfile.NamedTemporaryFile(delete=False) as outfile:
+def build_report_reader(fields: list[str] = None, dir: str | None = None):
+    with tempfile.NamedTemporaryFile(dir=dir, delete=False) as outfile:
         outfile.close()
         name = Path(outfile.name).stem
         try:
             yield ReportReader(name, outfile.name, fields)
         finally:
-            pass
\ No newline at end of file
+            if os.path.exists(outfile.name):
+                os.remove(outfile.name)
+            shutil.rmtree(outfile.name + SIDECAR_SUFFIX, ignore_errors=True)
\ No newline at end of file
@@ -1,9 +1,98 @@
 from abc import ABC, abstractmethod
+from typing import Iterator
+
+class Freezable:
+    """
+    An object that can be made immutable once it is built
+
+    Freezing also freezes the objects it holds and turns its lists into tuples.
+    A frozen object becomes an instance of a frozen subclass of its class, so that only frozen
+    objects pay for the checks on assignment.
+    """
+    __slots__ = ()
+
+    frozen = False
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if cls.__dict__.get("frozen"):
+            return
+        # Named after the class so that frozen objects pickle and print like any other
+        members = {"__slots__": (), "__module__": cls.__module__, "__qualname__": f"{cls.__qualname__}._Frozen", "frozen": True}
+        members.update(cls._frozen_members())
+        cls._Frozen = type(cls)(cls.__name__, (cls,), members)
+
+    @classmethod
+    def _frozen_members(cls) -> dict:
+        """Attributes of the frozen subclass"""
+        def __setattr__(self, name, value):
+            raise AttributeError(f"Cannot set {name}, {type(self).__name__} is frozen")
+        return {"__setattr__": __setattr__}
+
+    def freeze(self):
+        if self.frozen:
+            return self
+        names = [slot for cls in type(self).__mro__ for slot in cls.__dict__.get("__slots__", ())]
+        names.extend(getattr(self, "__dict__", ()))
+        for name in names:
+            value = getattr(self, name, None)
+            if isinstance(value, Freezable):
+                value.freeze()
+            elif isinstance(value, list):
+                for item in value:
+                    if isinstance(item, Freezable):
+                        item.freeze()
+                setattr(self, name, tuple(value))
+        self.__class__ = type(self)._Frozen
+        return self
+
+    def __setstate__(self, state):
+        # Bypass __setattr__, which would refuse to restore the attributes of a frozen object
+        for values in state if isinstance(state, tuple) else (state,):
+            for name, value in (values or {}).items():
+                object.__setattr__(self, name, value)
+
+class Resource(Freezable, ABC):
+    __slots__ = ("name", "_script")
 
-class Resource(ABC):
     def __init__(self, name: str) -> None:
         self.name = name
 
+    @classmethod
+    def _frozen_members(cls) -> dict:
+        members = super()._frozen_members()
+        method = cls.to_gmat_script
+
+        # A frozen resource cannot change, so its script is built once
+        def to_gmat_script(self):
+            try:
+                return self._script
+            except AttributeError:
+                script = method(self)
+                object.__setattr__(self, "_script", script)
+                return script
+        members["to_gmat_script"] = to_gmat_script
+        return members
+
     @abstractmethod
     def to_gmat_script(self) -> str:
-        pass
\ No newline at end of file
+        pass
+
+    def iter_gmat_script(self) -> Iterator[str]:
+        """Yields the lines of the resource (resources may yield several lines at once)"""
+        yield self.to_gmat_script()
+
+    def freeze(self):
+        """Makes the resource immutable, caching its script once it has been serialized"""
+        for dependency in self.dependencies():
+            dependency.freeze()
+        return super().freeze()
+
+    def dependencies(self) -> list["Resource"]:
+        """Resources that must be created before this one"""
+        return []
+
+    @property
+    def predefined(self) -> bool:
+        """Whether GMAT creates the resource itself"""
+        return False
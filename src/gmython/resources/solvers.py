@@ -12,6 +12,8 @@ class DCDerivativeMethod(Enum):
     BackwardDifference = 3
 
 class DifferentialCorrector(Resource):
+    __slots__ = ("algorithm", "max_iter", "derivative_method")
+
     def __init__(self, name, algorithm: DCAlgorithm = DCAlgorithm.NewtonRaphson, max_iter: int = 25, derivative_method = DCDerivativeMethod.ForwardDifference):
         super().__init__(name)
         self.algorithm = algorithm
@@ -1,16 +1,26 @@
 from abc import abstractmethod
 
-from .resource import Resource
+from .resource import Resource, Freezable
 from .coordsys import CoordinateSystem, EARTHMJ2000EQ
 from .epoch import Epoch, TimeStandard, ModJulianEpoch
 from .celestial import CelestialBody
+from .param import Param
+
+class State(Freezable):
+    __slots__ = ()
 
-class State:
     @abstractmethod
     def to_gmat_script(self, name: str) -> str:
         pass
 
+    @abstractmethod
+    def elements(self) -> dict[str, float]:
+        """The GMAT fields of the state and their values, in the order they are written"""
+        pass
+
 class CartesianState(State):
+    __slots__ = ("x", "y", "z", "vx", "vy", "vz")
+
     def __init__(self, x: float, y: float, z: float, vx: float, vy: float, vz: float):
         self.x = x
         self.y = y
@@ -30,7 +40,12 @@ class CartesianState(State):
             f"GMAT {name}.VZ = {self.vz};"
         )
 
+    def elements(self) -> dict[str, float]:
+        return {"X": self.x, "Y": self.y, "Z": self.z, "VX": self.vx, "VY": self.vy, "VZ": self.vz}
+
 class KeplerianState(State):
+    __slots__ = ("sma", "ecc", "inc", "raan", "aop", "ta")
+
     def __init__(self, sma: float, ecc: float, inc: float, raan: float, aop: float, ta: float):
         self.sma = sma    # Semi-major axis
         self.ecc = ecc    # Eccentricity
@@ -50,9 +65,14 @@ class KeplerianState(State):
             f"GMAT {name}.TA = {self.ta};"
         )
 
+    def elements(self) -> dict[str, float]:
+        return {"SMA": self.sma, "ECC": self.ecc, "INC": self.inc, "RAAN": self.raan, "AOP": self.aop, "TA": self.ta}
+
 class ModifiedKeplerianState(State):
+    __slots__ = ("radper", "radapo", "inc", "raan", "aop", "ta")
+
     def __init__(self, radper: float, radapo: float, inc: float, raan: float, aop: float, ta: float):
-        if radapo < radper:
+        if not isinstance(radper, Param) and not isinstance(radapo, Param) and radapo < radper:
             raise Exception("Apoapsis radius must be larger than periapsis radius")
         self.radper = radper    # Radius of perigee
         self.radapo = radapo    # Radius of apogee
@@ -72,6 +92,9 @@ class ModifiedKeplerianState(State):
             f"GMAT {name}.TA = {self.ta};"
         )
 
+    def elements(self) -> dict[str, float]:
+        return {"RadApo": self.radapo, "RadPer": self.radper, "INC": self.inc, "RAAN": self.raan, "AOP": self.aop, "TA": self.ta}
+
 class BodyRelativeProperties:
     def __init__(self, name: str, body: CelestialBody):
         self.preamble = f"{name}.{body.name}."
@@ -98,6 +121,8 @@ class BodyRelativeProperties:
         return self.preamble + "RadPer"
 
 class Spacecraft(Resource):
+    __slots__ = ("state", "epoch", "coordinate_system")
+
     def __init__(self, name: str, state: State, epoch: Epoch = ModJulianEpoch(TimeStandard.TAI, 21545.0), coord_system: CoordinateSystem = EARTHMJ2000EQ) -> None:
         super().__init__(name)
         self.name = name
@@ -113,6 +138,9 @@ class Spacecraft(Resource):
         )
         state_script = self.state.to_gmat_script(self.name)
         return base_script + state_script
+
+    def dependencies(self) -> list[Resource]:
+        return [self.coordinate_system]
     
     def relative_to(self, body: CelestialBody) -> BodyRelativeProperties:
         return BodyRelativeProperties(self.name, body)
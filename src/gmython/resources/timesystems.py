@@ -0,0 +1,202 @@
+import numpy as np
+from .epoch import TimeStandard, MODJULIAN_OFFSET, MONTHS, _UNIX_MODJULIAN, _days_from_civil, _civil_from_days
+
+# TAI - UTC in seconds from each Julian date on, as a + (MJD - b) * c with MJD = JD - 2400000.5 (USNO tai-utc.dat)
+LEAP_SECONDS = (
+    (2437300.5, 1.4228180, 37300.0, 0.001296),
+    (2437512.5, 1.3728180, 37300.0, 0.001296),
+    (2437665.5, 1.8458580, 37665.0, 0.0011232),
+    (2438334.5, 1.9458580, 37665.0, 0.0011232),
+    (2438395.5, 3.2401300, 38761.0, 0.001296),
+    (2438486.5, 3.3401300, 38761.0, 0.001296),
+    (2438639.5, 3.4401300, 38761.0, 0.001296),
+    (2438761.5, 3.5401300, 38761.0, 0.001296),
+    (2438820.5, 3.6401300, 38761.0, 0.001296),
+    (2438942.5, 3.7401300, 38761.0, 0.001296),
+    (2439004.5, 3.8401300, 38761.0, 0.001296),
+    (2439126.5, 4.3131700, 39126.0, 0.002592),
+    (2439887.5, 4.2131700, 39126.0, 0.002592),
+    (2441317.5, 10.0, 0.0, 0.0),
+    (2441499.5, 11.0, 0.0, 0.0),
+    (2441683.5, 12.0, 0.0, 0.0),
+    (2442048.5, 13.0, 0.0, 0.0),
+    (2442413.5, 14.0, 0.0, 0.0),
+    (2442778.5, 15.0, 0.0, 0.0),
+    (2443144.5, 16.0, 0.0, 0.0),
+    (2443509.5, 17.0, 0.0, 0.0),
+    (2443874.5, 18.0, 0.0, 0.0),
+    (2444239.5, 19.0, 0.0, 0.0),
+    (2444786.5, 20.0, 0.0, 0.0),
+    (2445151.5, 21.0, 0.0, 0.0),
+    (2445516.5, 22.0, 0.0, 0.0),
+    (2446247.5, 23.0, 0.0, 0.0),
+    (2447161.5, 24.0, 0.0, 0.0),
+    (2447892.5, 25.0, 0.0, 0.0),
+    (2448257.5, 26.0, 0.0, 0.0),
+    (2448804.5, 27.0, 0.0, 0.0),
+    (2449169.5, 28.0, 0.0, 0.0),
+    (2449534.5, 29.0, 0.0, 0.0),
+    (2450083.5, 30.0, 0.0, 0.0),
+    (2450630.5, 31.0, 0.0, 0.0),
+    (2451179.5, 32.0, 0.0, 0.0),
+    (2453736.5, 33.0, 0.0, 0.0),
+    (2454832.5, 34.0, 0.0, 0.0),
+    (2456109.5, 35.0, 0.0, 0.0),
+    (2457204.5, 36.0, 0.0, 0.0),
+    (2457754.5, 37.0, 0.0, 0.0),
+)
+
+# The table as ModJulian columns, with each start also expressed in TAI for the reverse lookup
+_STARTS, _OFFSETS, _REFERENCES, _RATES = (np.array(column) for column in zip(*LEAP_SECONDS))
+_STARTS = _STARTS - MODJULIAN_OFFSET
+_REFERENCES = _REFERENCES + 2400000.5 - MODJULIAN_OFFSET
+_TAI_STARTS = _STARTS + (_OFFSETS + (_STARTS - _REFERENCES) * _RATES) / 86400.0
+
+# TT - TAI in seconds
+TT_OFFSET = 32.184
+
+_J2000 = 2451545.0 - MODJULIAN_OFFSET
+
+def _tdb_minus_tt(tt: np.ndarray) -> np.ndarray:
+    """TDB - TT in days, from the mean anomaly of the Earth (the approximation GMAT uses)"""
+    g = np.radians(357.53 + 0.9856003 * (tt - _J2000))
+    return (0.001658 * np.sin(g) + 0.000014 * np.sin(2.0 * g)) / 86400.0
+
+def _table(starts: np.ndarray, times: np.ndarray) -> tuple[np.ndarray, ...]:
+    # Dates before the table have no offset
+    index = np.searchsorted(starts, times, "right") - 1
+    before = index < 0
+    index = np.maximum(index, 0)
+    offsets = np.where(before, 0.0, _OFFSETS[index])
+    rates = np.where(before, 0.0, _RATES[index])
+    return offsets, _REFERENCES[index], rates
+
+def tai_minus_utc(utc) -> np.ndarray:
+    """TAI - UTC in seconds at each UTC ModJulian date"""
+    utc = np.asarray(utc, dtype=np.float64)
+    offsets, references, rates = _table(_STARTS, utc)
+    return offsets + (utc - references) * rates
+
+def _to_tai(times: np.ndarray, standard: TimeStandard) -> np.ndarray:
+    if standard == TimeStandard.TAI:
+        return times
+    if standard == TimeStandard.UTC:
+        return times + tai_minus_utc(times) / 86400.0
+    if standard == TimeStandard.TDB:
+        # One fixed point step is well below a nanosecond
+        times = times - _tdb_minus_tt(times - _tdb_minus_tt(times))
+    return times - TT_OFFSET / 86400.0
+
+def _from_tai(tai: np.ndarray, standard: TimeStandard) -> np.ndarray:
+    if standard == TimeStandard.TAI:
+        return tai
+    if standard == TimeStandard.UTC:
+        # Solved exactly, since the offset is linear in UTC within each entry
+        offsets, references, rates = _table(_TAI_STARTS, tai)
+        return (tai - (offsets - references * rates) / 86400.0) / (1.0 + rates / 86400.0)
+    tt = tai + TT_OFFSET / 86400.0
+    if standard == TimeStandard.TDB:
+        return tt + _tdb_minus_tt(tt)
+    return tt
+
+def convert_modjulian(times, source: TimeStandard, target: TimeStandard) -> np.ndarray:
+    """
+    Converts ModJulian dates, a scalar or any array, from one time standard to another
+
+    UTC goes through the bundled `LEAP_SECONDS` table; an instant inside a leap second has no distinct UTC date.
+    """
+    times = np.asarray(times, dtype=np.float64)
+    if source == target:
+        return times.copy()
+    return _from_tai(_to_tai(times, source), target)
+
+def _characters(values, width: int) -> tuple[np.ndarray, np.ndarray]:
+    """The character codes of each string, read in place, and whether each string has exactly `width` characters"""
+    values = np.ascontiguousarray(values)
+    if values.dtype.kind != "U":
+        values = values.astype(str)
+    valid = np.char.str_len(values) == width
+    if values.dtype.itemsize < 4 * width:
+        return np.zeros((len(values), width), dtype=np.uint32), valid & False
+    return values.view(np.uint32).reshape(len(values), -1), valid
+
+def _number(codes: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    # Codes below "0" wrap around to large values
+    digits = codes - np.uint32(ord("0"))
+    valid = (digits < 10).all(axis=1)
+    return digits.astype(np.int64) @ 10 ** np.arange(digits.shape[1] - 1, -1, -1), valid
+
+def _pack(codes: np.ndarray) -> np.ndarray:
+    # Unicode code points fit in 21 bits
+    codes = codes.astype(np.int64)
+    return (codes[:, 0] << 42) | (codes[:, 1] << 21) | codes[:, 2]
+
+# Each month name packed into one integer, sorted for binary search
+_MONTH_CODES = _pack(np.array([[ord(c) for c in month] for month in MONTHS], dtype=np.uint32))
+_MONTH_ORDER = np.argsort(_MONTH_CODES)
+
+def gregorian_to_modjulian(day, month, year, clock) -> np.ndarray:
+    """
+    Decodes the whitespace separated pieces of Gregorian epochs as GMAT writes them, such as `01 Jan 2000 11:59:28.000`
+
+    Takes an array of strings per piece and returns the ModJulian dates. Raises ValueError if any epoch is malformed.
+    The strings are read as character codes, without converting each one to a Python object.
+    """
+    codes, valid = _characters(day, 2)
+    day, digits = _number(codes[:, :2])
+    valid &= digits
+
+    codes, characters = _characters(month, 3)
+    packed = _pack(codes[:, :3])
+    position = np.minimum(np.searchsorted(_MONTH_CODES[_MONTH_ORDER], packed), 11)
+    month = _MONTH_ORDER[position] + 1
+    valid &= characters & (_MONTH_CODES[_MONTH_ORDER][position] == packed)
+
+    codes, characters = _characters(year, 4)
+    year, digits = _number(codes[:, :4])
+    valid &= characters & digits
+
+    # HH:MM:SS.mmm
+    codes, characters = _characters(clock, 12)
+    valid &= characters & (codes[:, 2] == ord(":")) & (codes[:, 5] == ord(":")) & (codes[:, 8] == ord("."))
+    hour, digits = _number(codes[:, 0:2])
+    valid &= digits
+    minute, digits = _number(codes[:, 3:5])
+    valid &= digits
+    second, digits = _number(codes[:, 6:8])
+    valid &= digits
+    millis, digits = _number(codes[:, 9:12])
+    valid &= digits
+
+    valid &= (day >= 1) & (day <= 31) & (hour < 24) & (minute < 60) & (second < 61)
+    if not valid.all():
+        raise ValueError(f"{np.count_nonzero(~valid)} malformed Gregorian epochs")
+
+    days = _days_from_civil(year, month, day)
+    return days + _UNIX_MODJULIAN + (((hour * 60 + minute) * 60 + second) * 1000 + millis) / 86400000.0
+
+def modjulian_to_gregorian(times) -> np.ndarray:
+    """Formats ModJulian dates as GMAT Gregorian strings, such as `01 Jan 2000 11:59:28.000`, rounded to the millisecond"""
+    times = np.atleast_1d(np.asarray(times, dtype=np.float64))
+    millis = np.round((times - _UNIX_MODJULIAN) * 86400000.0).astype(np.int64)
+    days, millis = np.divmod(millis, 86400000)
+    year, month, day = _civil_from_days(days)
+    if np.any((year < 0) | (year > 9999)):
+        raise ValueError("Gregorian epochs are limited to years 0 to 9999")
+
+    # Assemble the characters of every epoch at once
+    text = np.full((len(times), 24), ord(" "), dtype=np.uint8)
+    def put(column: int, values: np.ndarray, width: int):
+        for place in range(width):
+            text[:, column + width - 1 - place] = ord("0") + (values // 10 ** place) % 10
+    put(0, day, 2)
+    text[:, 3:6] = np.frombuffer("".join(MONTHS).encode("ascii"), dtype=np.uint8).reshape(12, 3)[month - 1]
+    put(7, year, 4)
+    put(12, millis // 3600000, 2)
+    text[:, 14] = ord(":")
+    put(15, millis // 60000 % 60, 2)
+    text[:, 17] = ord(":")
+    put(18, millis // 1000 % 60, 2)
+    text[:, 20] = ord(".")
+    put(21, millis % 1000, 3)
+    return text.view("S24").reshape(-1).astype(str)
@@ -1,8 +1,35 @@
 from .resource import Resource
 
 class Variable(Resource):
+    __slots__ = ()
+
     def __init__(self, name: str):
         super().__init__(name)
 
     def to_gmat_script(self):
-        return "Create Variable " + self.name + ";"
\ No newline at end of file
+        return "Create Variable " + self.name + ";"
+
+class Array(Resource):
+    """A GMAT array, optionally filled with `values` in row-major order"""
+    __slots__ = ("rows", "columns", "values")
+
+    def __init__(self, name: str, rows: int, columns: int = 1, values: list[float] | None = None):
+        super().__init__(name)
+        if rows < 1 or columns < 1:
+            raise ValueError("Array dimensions must be greater than zero")
+        if values is not None and len(values) != rows * columns:
+            raise ValueError(f"Expecting {rows * columns} values, got {len(values)}")
+        self.rows = rows
+        self.columns = columns
+        self.values = values
+
+    def to_gmat_script(self):
+        lines = [f"Create Array {self.name}[{self.rows},{self.columns}];"]
+        if self.values is not None:
+            for i, value in enumerate(self.values):
+                lines.append(f"GMAT {self.element(i // self.columns + 1, i % self.columns + 1)} = {value};")
+        return "\n".join(lines)
+
+    def element(self, row, column = 1) -> str:
+        """The element at a one-based row and column, which may be variable names"""
+        return f"{self.name}({row}, {column})"
\ No newline at end of file
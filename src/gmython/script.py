@@ -1,8 +1,10 @@
 from abc import ABC, abstractmethod
 from enum import Enum
 from contextlib import contextmanager
+from typing import Iterator
 from .resources.resource import Resource
-from .mission import MissionStep
+from .resources.report import ReportFile, ReportReader
+from .mission import MissionStep, MissionLogic
 
 class ObjectType(Enum):
     RESOURCE = 1
@@ -21,32 +23,124 @@ class Script:
     def __init__(self, resources: list[Resource], mission: list[MissionStep]) -> None:
         self.resources = resources
         self.mission = mission
+        self.redirects: dict[str, str] = {}
 
-    def serialize(self) -> str:
+    def collect_resources(self) -> list[Resource]:
         """
-        Takes a list of ScriptObject instances and returns a GMAT script string.
+        The resources of the script, including those only referenced by other resources or by mission steps
+
+        Each resource appears once, after the resources it depends on, with `resources` taking precedence in the order.
+        Reports come last, since their fields refer to the other resources by name. Resources predefined by GMAT are left out.
+        Raises ValueError if two different resources share a name.
         """
-        script_lines = []
+        collected: list[Resource] = []
+        names: dict[str, Resource] = {}
+        visited: set[int] = set()
+
+        def visit(resource: Resource):
+            if id(resource) in visited:
+                return
+            visited.add(id(resource))
+            for dependency in resource.dependencies():
+                visit(dependency)
+            if resource.predefined:
+                return
+            existing = names.get(resource.name)
+            if existing is None:
+                names[resource.name] = resource
+                collected.append(resource)
+            elif existing.to_gmat_script() != resource.to_gmat_script():
+                raise ValueError(f"Script has two different resources named {resource.name}")
+
+        def walk(steps: list[MissionStep]):
+            for step in steps:
+                for resource in step.resources():
+                    visit(resource)
+                if isinstance(step, MissionLogic):
+                    walk(step.contents)
+
         for resource in self.resources:
-            # Serialize and append the object
-            script_lines.append(resource.to_gmat_script())
+            visit(resource)
+        walk(self.mission)
+        reports = [resource for resource in collected if isinstance(resource, (ReportFile, ReportReader))]
+        return [resource for resource in collected if not isinstance(resource, (ReportFile, ReportReader))] + reports
+
+    def reports(self) -> list[ReportFile | ReportReader]:
+        """The report resources of the script"""
+        return [resource for resource in self.collect_resources() if isinstance(resource, (ReportFile, ReportReader))]
+
+    def _report_paths(self) -> list[str]:
+        return [report.outfile if isinstance(report, ReportFile) else report.file for report in self.reports()]
+
+    def outputs(self) -> list[str]:
+        """Paths of the report files written by the script"""
+        return [self.redirects.get(path, path) for path in self._report_paths()]
+
+    def redirected(self, outputs: dict[str, str]) -> "Script":
+        """A shallow copy of the script that writes the reports in `outputs` to other paths"""
+        import copy
+        script = copy.copy(self)
+        script.redirects = {path: outputs.get(redirect, redirect) for path, redirect in self.redirects.items()}
+        redirected = set(self.redirects.values())
+        for path, redirect in outputs.items():
+            if path not in redirected:
+                script.redirects.setdefault(path, redirect)
+        return script
+
+    def serialize(self, outputs: dict[str, str] | None = None) -> str:
+        """
+        Takes a list of ScriptObject instances and returns a GMAT script string.
+
+        `outputs` optionally maps report file paths to the paths written in their place.
+        """
+        return "\n".join(self.iter_lines(outputs))
+
+    def iter_lines(self, outputs: dict[str, str] | None = None) -> Iterator[str]:
+        """
+        Yields the script in pieces of one or more whole lines, without building the full text
+
+        Joining the pieces with newlines gives `serialize()`.
+        """
+        mappings = [mapping for mapping in (self.redirects, outputs) if mapping]
+        for piece in self._lines():
+            if not piece.isascii():
+                piece = piece.encode("ascii", errors="ignore").decode()
+            for mapping in mappings:
+                for path, replacement in mapping.items():
+                    if path in piece:
+                        piece = piece.replace(f"'{path}'", f"'{replacement}'")
+            yield piece
+
+    def _lines(self) -> Iterator[str]:
+        for resource in self.collect_resources():
+            # Serialize the object, leaving a blank line after it
+            yield from resource.iter_gmat_script()
+            yield ""
 
         # Start the mission sequence
-        script_lines.append("BeginMissionSequence;")
-        for step in self.mission:           
-            # Serialize and append the object
-            script_lines.append(step.to_gmat_script())
+        yield "BeginMissionSequence;"
+        for step in self.mission:
+            yield ""
+            yield from step.iter_gmat_script()
 
-        # Return the full script
-        return "\n\n".join(script_lines).encode("ascii", errors="ignore").decode()
+    def write(self, fp, outputs: dict[str, str] | None = None):
+        """Streams the script to a text file object"""
+        first = True
+        for piece in self.iter_lines(outputs):
+            if not first:
+                fp.write("\n")
+            fp.write(piece)
+            first = False
 
     @contextmanager
-    def as_temp_file(self):
+    def as_temp_file(self, dir: str | None = None):
+        import os
         import tempfile
-        with tempfile.NamedTemporaryFile(suffix=".script", delete=False) as outfile:
-            outfile.write(self.serialize().encode(encoding='ascii'))
+        with tempfile.NamedTemporaryFile("w", suffix=".script", dir=dir, encoding="ascii", delete=False) as outfile:
+            self.write(outfile)
             outfile.close()
             try:
                 yield outfile.name
             finally:
-                pass
\ No newline at end of file
+                if os.path.exists(outfile.name):
+                    os.remove(outfile.name)
\ No newline at end of file
@@ -0,0 +1,85 @@
+import math
+from .script import Script
+from .mission import MissionStep, ForLoop, Assign, Report
+from .resources.resource import Resource
+from .resources.spacecraft import Spacecraft
+from .resources.burns import ImpulseiveBurn
+from .resources.variable import Variable, Array
+from .resources.report import ReportFile, ReportReader
+
+def _arithmetic(values: list[float]) -> float | None:
+    """The common difference of the values, if they are evenly spaced"""
+    if len(values) < 2:
+        return None
+    step = values[1] - values[0]
+    if step == 0:
+        return None
+    for previous, value in zip(values, values[1:]):
+        if not math.isclose(value - previous, step, rel_tol=1e-12, abs_tol=1e-12 * abs(step)):
+            return None
+    return step
+
+# State elements taken relative to the origin of a coordinate system rather than to the coordinate system itself
+_ORIGIN_FIELDS = {"SMA", "ECC", "TA", "RadApo", "RadPer"}
+
+def _state_parameter(sat: Spacecraft, field: str) -> str:
+    """The parameter of a state element in the spacecraft's own coordinate system, as in `keplerian_headers`"""
+    frame = sat.coordinate_system
+    return f"{sat.name}.{frame.origin if field in _ORIGIN_FIELDS else frame.name}.{field}"
+
+def _resets(resource: Resource) -> list[MissionStep]:
+    """Steps that put a resource back in its initial state"""
+    if isinstance(resource, Spacecraft):
+        steps = [Assign(*resource.epoch.assignment(resource.name))]
+        steps.extend(Assign(_state_parameter(resource, field), value) for field, value in resource.state.elements().items())
+        return steps
+    if isinstance(resource, ImpulseiveBurn):
+        return [Assign(f"{resource.name}.Element{i + 1}", value) for i, value in enumerate(resource.vector)]
+    return []
+
+def _unique(name: str, taken: set[str]) -> str:
+    while name in taken:
+        name += "_"
+    return name
+
+def compile_sweep(script: Script, parameter: str, values: list[float], fields: list[str], report: ReportFile | ReportReader) -> Script:
+    """
+    Compiles a sweep of `parameter` over `values` into one script instead of one script per value
+
+    `parameter` must be assignable in the mission sequence, such as `Sat1.EarthMJ2000Eq.INC` or `Burn1.Element1`.
+    Each iteration puts the spacecraft and burns back in their initial state, assigns the next value,
+    runs the mission of `script` and reports the value followed by `fields` to `report`, which
+    should have no fields of its own so that it holds exactly one row per value. The value is reported
+    from a `SweepValue` variable, since `parameter` itself has changed by the end of the mission.
+    Reports of `script` itself keep writing on every iteration, so a report with fields of its own
+    collects the steps of every value.
+    """
+    if not values:
+        raise ValueError("Must have at least one value to sweep")
+
+    resources = script.collect_resources()
+    taken = {resource.name for resource in resources}
+    index = Variable(_unique("SweepIndex", taken))
+    swept = Variable(_unique("SweepValue", taken))
+    added: list[Resource] = [index, swept]
+
+    # Evenly spaced values are computed from the loop index, anything else is read from an array
+    step = _arithmetic(values)
+    if step is not None:
+        value = f"{values[0]} + {step} * ({index.name} - 1)"
+    else:
+        array = Array(_unique("SweepValues", taken), len(values), 1, list(values))
+        added.append(array)
+        value = array.element(index.name)
+
+    loop = ForLoop(index, 1, 1, len(values))
+    for resource in resources:
+        for reset in _resets(resource):
+            loop.append(reset)
+    loop.append(Assign(swept.name, value))
+    loop.append(Assign(parameter, swept.name))
+    for mission_step in script.mission:
+        loop.append(mission_step)
+    loop.append(Report(report, [swept.name, *fields]))
+
+    return Script([*script.resources, *added, report], [loop])
@@ -0,0 +1,44 @@
+from typing import Iterator
+from .script import Script
+from .resources.param import Param, Slots
+
+class ScriptTemplate:
+    """
+    A script compiled once into literal text and named parameter slots
+
+    Build the script with `Param` placeholders where values vary between variants, such as
+    `KeplerianState(2000.0, 0.0, Param("inc"), 0.0, 0.0, 0.0)`. Each variant is then rendered by
+    filling the slots of the precomputed text instead of serializing the whole script again.
+    """
+    def __init__(self, script: Script):
+        self.script = script
+        self.text = Slots(script.serialize())
+        self.params = self.text.params
+        self.output_paths = [Slots(str(path)) for path in script._report_paths()]
+
+    def render(self, **values) -> str:
+        try:
+            return self.text.render(values)
+        except KeyError:
+            missing = [name for name in self.params if name not in values]
+            raise ValueError(f"Missing values for parameters: {', '.join(missing)}") from None
+
+    def write(self, fp, **values):
+        fp.write(self.render(**values))
+
+    def variant(self, **values) -> "TemplateVariant":
+        """A script that can be dispatched like any other"""
+        return TemplateVariant(self, values)
+
+class TemplateVariant(Script):
+    """A script rendered from a `ScriptTemplate`"""
+    def __init__(self, template: ScriptTemplate, values: dict):
+        super().__init__(template.script.resources, template.script.mission)
+        self.template = template
+        self.values = values
+
+    def _report_paths(self) -> list[str]:
+        return [path.render(self.values) for path in self.template.output_paths]
+
+    def _lines(self) -> Iterator[str]:
+        yield self.template.render(**self.values)
@@ -0,0 +1,138 @@
+import numpy as np
+from .resources.resource import Resource
+from .resources.coordsys import CoordinateSystem
+from .resources.report import ReportReader, cartesian_headers
+
+# Queries are interpolated in blocks of this many epochs to bound the size of the basis arrays
+_BLOCK = 4096
+
+def _basis(t: np.ndarray, nodes: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    The Lagrange basis polynomials of each row of `nodes`, and their derivatives, evaluated at `t`
+
+    Also returns the derivative of each basis polynomial at its own node, which Hermite interpolation needs.
+    """
+    points = nodes.shape[1]
+    own = np.eye(points, dtype=bool)
+
+    # (x_j - x_k) for k != j, and (t - x_k) for k != j
+    spans = nodes[:, :, None] - nodes[:, None, :]
+    spans[:, own] = 1.0
+    denominators = spans.prod(axis=2)
+    factors = np.repeat((t[:, None] - nodes)[:, None, :], points, axis=1)
+    factors[:, own] = 1.0
+    values = factors.prod(axis=2) / denominators
+
+    # The derivative of each basis polynomial is a sum of products that each leave out one more factor
+    partial = np.repeat(factors[:, :, None, :], points, axis=2)
+    partial[:, :, own] = 1.0
+    products = partial.prod(axis=3)
+    products[:, own] = 0.0
+    derivatives = products.sum(axis=2) / denominators
+
+    inverse = 1.0 / spans
+    inverse[:, own] = 0.0
+    return values, derivatives, inverse.sum(axis=2)
+
+class Trajectory:
+    """
+    Cartesian states at increasing times, such as the rows of a report, that can be sampled at any time in between
+
+    `scale` is the number of seconds in a unit of `times` (1 for `ElapsedSecs`, 86400 for days), so that
+    velocities in km/s stay consistent with positions in km. Rows repeating a time keep the last state,
+    which is the state after a maneuver.
+    """
+    def __init__(self, times, positions, velocities, scale: float = 1.0):
+        times = np.asarray(times, dtype=np.float64)
+        positions = np.asarray(positions, dtype=np.float64)
+        velocities = np.asarray(velocities, dtype=np.float64)
+        if positions.shape != (len(times), 3) or velocities.shape != (len(times), 3):
+            raise ValueError("Expecting a position and velocity vector for each time")
+        if np.any(times[1:] < times[:-1]):
+            raise ValueError("Times must be in increasing order")
+
+        # Keep the last of any repeated times
+        keep = np.append(times[1:] != times[:-1], True)
+        self.times = times[keep]
+        self.positions = positions[keep]
+        self.velocities = velocities[keep]
+        self.scale = scale
+        if len(self.times) < 2:
+            raise ValueError("Must have at least two distinct times")
+
+    @staticmethod
+    def from_columns(columns: dict, spacecraft: Resource, frame: CoordinateSystem, time: str | None = None, scale: float | None = None) -> "Trajectory":
+        """
+        Builds a trajectory from parsed report columns (see `parse_report_columns`) holding `cartesian_headers(spacecraft, frame)`
+
+        `time` defaults to the spacecraft's `ElapsedSecs`. Unless given, `scale` is 1 for fields ending in `Secs` and 86400 otherwise.
+        """
+        time = time if time is not None else f"{spacecraft.name}.ElapsedSecs"
+        fields = [time, *cartesian_headers(spacecraft, frame)]
+        missing = [field for field in fields if field not in columns]
+        if missing:
+            raise ValueError(f"Report has no fields: {', '.join(missing)}")
+        if scale is None:
+            scale = 1.0 if time.endswith("Secs") else 86400.0
+        states = np.column_stack([columns[field] for field in fields[1:]])
+        return Trajectory(columns[time], states[:, :3], states[:, 3:], scale)
+
+    @staticmethod
+    def from_report(report: ReportReader, spacecraft: Resource, frame: CoordinateSystem, time: str | None = None, scale: float | None = None) -> "Trajectory":
+        return Trajectory.from_columns(report.load_columns(), spacecraft, frame, time, scale)
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def locate(self, times) -> np.ndarray:
+        """The index of the row that starts the interval containing each time, found by binary search"""
+        times = np.asarray(times, dtype=np.float64)
+        outside = (times < self.times[0]) | (times > self.times[-1])
+        if np.any(outside):
+            raise ValueError(f"{np.count_nonzero(outside)} times lie outside {self.times[0]} to {self.times[-1]}")
+        return np.minimum(np.searchsorted(self.times, times, "right") - 1, len(self.times) - 2)
+
+    def interpolate(self, times, points: int = 8, method: str = "lagrange") -> tuple[np.ndarray, np.ndarray]:
+        """
+        The positions and velocities at each time, interpolated over the `points` rows nearest to it
+
+        `lagrange` interpolates positions and velocities separately; `hermite` fits positions and
+        velocities together, reaching the same order with half as many points.
+        """
+        if method not in ("lagrange", "hermite"):
+            raise ValueError(f"Unknown interpolation method {method}")
+        points = min(points, len(self.times))
+        if points < 2:
+            raise ValueError("Must interpolate over at least two points")
+
+        times = np.atleast_1d(np.asarray(times, dtype=np.float64))
+        starts = np.clip(self.locate(times) - (points // 2 - 1), 0, len(self.times) - points)
+        positions = np.empty((len(times), 3))
+        velocities = np.empty((len(times), 3))
+        offsets = np.arange(points)
+        for block in range(0, len(times), _BLOCK):
+            rows = starts[block:block + _BLOCK, None] + offsets
+            # Work relative to the first node so that the products stay well conditioned
+            origin = self.times[rows[:, 0]]
+            t = times[block:block + _BLOCK] - origin
+            nodes = self.times[rows] - origin[:, None]
+            values, derivatives, own = _basis(t, nodes)
+            y = self.positions[rows]
+            dy = self.velocities[rows]
+
+            if method == "lagrange":
+                positions[block:block + _BLOCK] = np.einsum("mj,mjc->mc", values, y)
+                velocities[block:block + _BLOCK] = np.einsum("mj,mjc->mc", values, dy)
+                continue
+
+            # Hermite basis from the Lagrange basis, with velocities converted to the units of the times
+            dy = dy * self.scale
+            distance = t[:, None] - nodes
+            squared = values * values
+            h = (1.0 - 2.0 * own * distance) * squared
+            k = distance * squared
+            dh = -2.0 * own * squared + (1.0 - 2.0 * own * distance) * 2.0 * values * derivatives
+            dk = squared + distance * 2.0 * values * derivatives
+            positions[block:block + _BLOCK] = np.einsum("mj,mjc->mc", h, y) + np.einsum("mj,mjc->mc", k, dy)
+            velocities[block:block + _BLOCK] = (np.einsum("mj,mjc->mc", dh, y) + np.einsum("mj,mjc->mc", dk, dy)) / self.scale
+        return positions, velocities
@@ -0,0 +1,225 @@
+import json
+import os
+import socket
+import socketserver
+import struct
+import tempfile
+import threading
+from queue import Queue, Empty
+from typing import Iterator
+from .script import Script
+from .dispatch import Dispatch, DispatchError, MissionResult, RunStatus
+from .workspace import RunWorkspace
+
+DEFAULT_PORT = 5850
+
+def _send(sock: socket.socket, message: dict):
+    data = json.dumps(message).encode("utf-8")
+    sock.sendall(struct.pack("!I", len(data)) + data)
+
+def _receive(sock: socket.socket) -> dict | None:
+    def read(count: int) -> bytes | None:
+        data = b""
+        while len(data) < count:
+            chunk = sock.recv(count - len(data))
+            if not chunk:
+                return None
+            data += chunk
+        return data
+
+    header = read(4)
+    if header is None:
+        return None
+    data = read(struct.unpack("!I", header)[0])
+    if data is None:
+        raise ConnectionError("Connection closed mid-message")
+    return json.loads(data.decode("utf-8"))
+
+# The code sent back when the agent could not run a script at all, such as when GmatConsole is missing
+_AGENT_ERROR = -1
+
+def _placeholder(index: int) -> str:
+    return f"<output{index}>"
+
+class _Handler(socketserver.BaseRequestHandler):
+    server: "_Server"
+
+    def handle(self):
+        while True:
+            request = _receive(self.request)
+            if request is None:
+                return
+            with self.server.slots:
+                response = self.server.execute(request)
+            _send(self.request, response)
+
+class _Server(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address: tuple[str, int], slots: int, root: str | None, shm: bool):
+        super().__init__(address, _Handler)
+        self.slots = threading.BoundedSemaphore(slots)
+        self.root = root
+        self.shm = shm
+
+    def execute(self, request: dict) -> dict:
+        """Runs a requested script, replying with the error instead of dropping the connection if it cannot be run"""
+        try:
+            return self._execute(request["script"], request["outputs"])
+        except Exception as e:
+            return {"code": _AGENT_ERROR, "log": "", "error": f"{type(e).__name__}: {e}", "outputs": []}
+
+    def _execute(self, text: str, outputs: int) -> dict:
+        with RunWorkspace(self.root, self.shm) as workspace:
+            paths = [workspace.path(f"output{i}") for i in range(outputs)]
+            for i, path in enumerate(paths):
+                open(path, "w").close()
+                text = text.replace(f"'{_placeholder(i)}'", f"'{path}'")
+
+            script = workspace.path("mission.script")
+            with open(script, "w", encoding="ascii") as file:
+                file.write(text)
+
+            log = workspace.path("mission.log")
+            open(log, "w").close()
+            try:
+                Dispatch(log, directory=workspace.directory).run(script)
+                code = 0
+            except DispatchError as e:
+                code = e.code
+
+            with open(log, "r", encoding="ascii", errors="replace") as file:
+                log_text = file.read()
+            reports = []
+            for path in paths:
+                with open(path, "r", encoding="ascii", errors="replace") as file:
+                    reports.append(file.read())
+        return {"code": code, "log": log_text, "outputs": reports}
+
+class WorkerAgent:
+    """
+    Accepts serialized scripts over TCP, runs them with `Dispatch` and sends back the reports they produce
+
+    At most `slots` scripts run at once, regardless of how many coordinators are connected.
+    There is no authentication; only listen on addresses reachable by trusted coordinators.
+    """
+    def __init__(self, host: str = "127.0.0.1", port: int = DEFAULT_PORT, slots: int | None = None, root: str | None = None, shm: bool = False):
+        self.slots = slots or os.cpu_count() or 1
+        self.server = _Server((host, port), self.slots, root, shm)
+
+    @property
+    def address(self) -> tuple[str, int]:
+        return self.server.server_address[:2]
+
+    def serve_forever(self):
+        self.server.serve_forever()
+
+    def start(self) -> threading.Thread:
+        """Serves from a background thread"""
+        thread = threading.Thread(target=self.serve_forever, daemon=True)
+        thread.start()
+        return thread
+
+    def shutdown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+class Agent:
+    """The address of a worker agent and the number of scripts to send it at once"""
+    def __init__(self, host: str, port: int = DEFAULT_PORT, slots: int = 1):
+        if slots < 1:
+            raise ValueError("Slots must be greater than zero")
+        self.host = host
+        self.port = port
+        self.slots = slots
+
+    @staticmethod
+    def parse(spec: str) -> "Agent":
+        """Parses `host[:port][/slots]`"""
+        address, _, slots = spec.partition("/")
+        host, _, port = address.partition(":")
+        return Agent(host, int(port) if port else DEFAULT_PORT, int(slots) if slots else 1)
+
+def _connection(agent: Agent, tasks: Queue, completed: Queue):
+    try:
+        with socket.create_connection((agent.host, agent.port)) as sock:
+            while True:
+                task = tasks.get()
+                if task is None:
+                    return
+                index, script = task
+                outputs = script.outputs()
+                _send(sock, {"script": script.serialize({path: _placeholder(i) for i, path in enumerate(outputs)}), "outputs": len(outputs)})
+                response = _receive(sock)
+                if response is None:
+                    raise ConnectionError(f"Worker {agent.host}:{agent.port} closed the connection")
+                completed.put((index, response))
+    except BaseException as e:
+        completed.put(e)
+
+def imap_distributed(missions: list[Script], agents: list[Agent]) -> Iterator[MissionResult]:
+    """
+    Runs a set of missions across worker agents, yielding each mission as it completes
+
+    Each agent is sent up to `Agent.slots` missions at once. Reports are written back to the paths in the original scripts.
+    A mission that GMAT fails to run is yielded with its error, with the worker's log copied to a local file;
+    if the agent could not run it at all, the local log holds the agent's error instead.
+    Once the caller stops iterating, agents finish the missions they are running but are sent no more.
+    """
+    if not missions:
+        return
+    if not agents:
+        raise ValueError("Must have at least one agent")
+
+    tasks = Queue()
+    for task in enumerate(missions):
+        tasks.put(task)
+
+    connections = sum(agent.slots for agent in agents)
+    for _ in range(connections):
+        tasks.put(None)
+
+    completed = Queue()
+    for agent in agents:
+        for _ in range(agent.slots):
+            threading.Thread(target=_connection, args=(agent, tasks, completed), daemon=True).start()
+
+    try:
+        remaining = len(missions)
+        while remaining:
+            result = completed.get()
+            if isinstance(result, BaseException):
+                raise result
+            index, response = result
+            remaining -= 1
+
+            script = missions[index]
+            if response["code"] != 0:
+                with tempfile.NamedTemporaryFile("w", suffix=".log", delete=False) as log:
+                    log.write(response.get("error", response["log"]))
+                yield MissionResult(index, script, RunStatus.FAILED, DispatchError(None, response["code"], log.name))
+                continue
+
+            for path, contents in zip(script.outputs(), response["outputs"]):
+                with open(path, "w", encoding="ascii") as file:
+                    file.write(contents)
+            yield MissionResult(index, script)
+    finally:
+        # Leave only the sentinels, so that the connections stop after their current mission
+        while True:
+            try:
+                tasks.get_nowait()
+            except Empty:
+                break
+        for _ in range(connections):
+            tasks.put(None)
+
+def distributed_process(missions: list[Script], agents: list[Agent]) -> list[MissionResult]:
+    """
+    Runs a set of missions across worker agents
+
+    A drop-in alternative to `parallel_process` for sweeps that do not fit on one machine.
+    Returns the result of each mission in the order of `missions`.
+    """
+    return sorted(imap_distributed(missions, agents), key=lambda result: result.index)
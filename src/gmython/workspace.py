@@ -0,0 +1,60 @@
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from .resources.report import ReportFile, ReportReader
+from .dispatch import Dispatch, ResultCache
+
+SHARED_MEMORY = "/dev/shm"
+
+class RunWorkspace:
+    """
+    A single directory holding the scripts, logs and reports of a run
+
+    The directory and everything in it is removed on exit unless `keep` is set.
+    With `shm`, the directory is created on `/dev/shm` where it is available so that
+    temporary files never touch the disk.
+    """
+    def __init__(self, root: str | None = None, shm: bool = False, keep: bool = False):
+        if root is None and shm and os.path.isdir(SHARED_MEMORY):
+            root = SHARED_MEMORY
+        self.root = root
+        self.keep = keep
+        self.directory: str | None = None
+
+    def __enter__(self) -> "RunWorkspace":
+        self.directory = tempfile.mkdtemp(prefix="gmython-", dir=self.root)
+        return self
+
+    def __exit__(self, *args):
+        self.cleanup()
+
+    def _require(self) -> str:
+        if self.directory is None:
+            raise RuntimeError("Workspace has not been created")
+        return self.directory
+
+    def path(self, name: str) -> str:
+        return os.path.join(self._require(), name)
+
+    def _reserve(self, suffix: str = "") -> str:
+        handle, path = tempfile.mkstemp(suffix=suffix, dir=self._require())
+        os.close(handle)
+        return path
+
+    def report_file(self, fields: list[str] = None, headers: bool = True, delimiter: str = " ") -> ReportFile:
+        path = self._reserve()
+        return ReportFile(Path(path).stem, path, fields, headers, delimiter)
+
+    def report_reader(self, fields: list[str] = None) -> ReportReader:
+        path = self._reserve()
+        return ReportReader(Path(path).stem, path, fields)
+
+    def dispatch(self, cache: ResultCache | None = None) -> Dispatch:
+        """Creates a dispatch instance that logs to and writes its scripts in the workspace"""
+        return Dispatch(self._reserve(".log"), cache, self._require())
+
+    def cleanup(self):
+        if self.directory is not None and not self.keep:
+            shutil.rmtree(self.directory, ignore_errors=True)
+            self.directory = None
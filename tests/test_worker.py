@@ -0,0 +1,106 @@
+import os
+import stat
+import sys
+import time
+import pytest
+from gmython.worker import WorkerAgent, Agent, distributed_process, imap_distributed
+from gmython.dispatch import RunStatus
+from gmython.mission import Report
+from gmython.script import Script
+from gmython.resources.report import ReportReader
+from gmython.resources.variable import Variable
+
+# Stands in for GmatConsole: records each run, fails scripts marked %FAIL and
+# writes one row per report holding the value of the script's `Value` comment
+STUB = """#!{python}
+import re, sys, time
+path = sys.argv[sys.argv.index("--run") + 1]
+with open({calls!r}, "a") as calls:
+    calls.write(path + "\\n")
+time.sleep({delay})
+text = open(path).read()
+if "%FAIL" in text:
+    sys.exit(1)
+value = re.search(r"% Value (\\S+)", text).group(1)
+for outfile in re.findall(r"\\.Filename = '([^']*)';", text):
+    with open(outfile, "w") as report:
+        report.write("Value\\n" + value + "\\n")
+"""
+
+class _Marked(Variable):
+    """A variable that also leaves a comment for the stub console"""
+    def __init__(self, name: str, comment: str):
+        super().__init__(name)
+        self.comment = comment
+
+    def to_gmat_script(self):
+        return f"{super().to_gmat_script()}\n% {self.comment}"
+
+def _console(directory, delay: float) -> str:
+    calls = os.path.join(directory, "calls")
+    open(calls, "w").close()
+    path = os.path.join(directory, "GmatConsole")
+    with open(path, "w") as file:
+        file.write(STUB.format(python=sys.executable, calls=calls, delay=delay))
+    os.chmod(path, os.stat(path).st_mode | stat.S_IEXEC)
+    return calls
+
+def _missions(directory, count: int, failing: set[int] = set()) -> list[Script]:
+    missions = []
+    for i in range(count):
+        report = ReportReader(f"Report{i}", os.path.join(directory, f"report{i}.txt"))
+        resources = [_Marked("V", f"Value {i}"), report]
+        if i in failing:
+            resources.append(_Marked("F", "%FAIL"))
+        missions.append(Script(resources, [Report(report, ["V"])]))
+    return missions
+
+@pytest.fixture
+def agents(tmp_path, monkeypatch):
+    """Starts two agents on localhost, with two slots each, running the stub console"""
+    monkeypatch.setenv("PATH", str(tmp_path) + os.pathsep + os.environ["PATH"])
+    workers = [WorkerAgent("127.0.0.1", 0, slots=2, root=str(tmp_path)) for _ in range(2)]
+    for worker in workers:
+        worker.start()
+    yield [Agent(*worker.address, slots=2) for worker in workers]
+    for worker in workers:
+        worker.shutdown()
+
+def test_distributed_process(tmp_path, agents):
+    calls = _console(tmp_path, 0.0)
+    missions = _missions(tmp_path, 12, failing={3, 8})
+    results = distributed_process(missions, agents)
+
+    assert [result.index for result in results] == list(range(12))
+    for i, result in enumerate(results):
+        if i in (3, 8):
+            assert result.status == RunStatus.FAILED
+            assert result.error.code == 1
+            os.remove(result.error.log)
+        else:
+            assert result.status == RunStatus.COMPLETED
+            assert missions[i].reports()[0].load() == [{"Value": float(i)}]
+    with open(calls) as file:
+        assert len(file.read().split()) == 12
+
+def test_agent_error(tmp_path, agents, monkeypatch):
+    # Without a console on the path the agents reply with their error
+    monkeypatch.setenv("PATH", str(tmp_path))
+    missions = _missions(tmp_path, 2)
+    results = distributed_process(missions, agents)
+    for result in results:
+        assert result.status == RunStatus.FAILED
+        with open(result.error.log) as log:
+            assert "FileNotFoundError" in log.read()
+        os.remove(result.error.log)
+
+def test_stop_early(tmp_path, agents):
+    calls = _console(tmp_path, 0.2)
+    results = imap_distributed(_missions(tmp_path, 40), agents)
+    next(results)
+    results.close()
+
+    # Only the missions already running when the caller stopped are finished
+    time.sleep(1.0)
+    with open(calls) as file:
+        assert len(file.read().split()) <= 8